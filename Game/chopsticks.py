@@ -79,17 +79,7 @@ class Chopsticks(Game):
         >>> ch1.is_over(ch1.current_state)
         True
         """
-        left = current_state.current_condition[0]
-        right = current_state.current_condition[1]
-        if current_state.current_player == 'p1':
-            if left % 5 == 0 and right % 5 == 0:
-                return True
-        elif current_state.current_player == 'p2':
-            left = current_state.current_condition[2]
-            right = current_state.current_condition[3]
-            if left % 5 == 0 and right % 5 == 0:
-                return True
-        return False
+        return current_state.is_over()
 
     def is_winner(self, winner: str) -> bool:
         """return if the winner wins the game.(who 's hand are not all dead)
@@ -99,10 +89,7 @@ class Chopsticks(Game):
         >>> ch1.is_winner('p2')
         True
         """
-        if self.is_over(self.current_state) and \
-                winner != self.current_state.current_player:
-            return True
-        return False
+        return self.current_state.get_winner() == winner
 
 
 if __name__ == "__main__":
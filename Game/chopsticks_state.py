@@ -1,12 +1,13 @@
 """module: chopstick_state(subclass of current_state)
 """
-from typing import List
+from typing import List, Tuple
 from current_state import State
 
 
 class ChopstickState(State):
     """a class represent the state of the chopstick game, a subclass of State.
     """
+    __slots__ = ()
     current_condition: List[int]
 
     def __init__(self) -> None:
@@ -32,9 +33,9 @@ class ChopstickState(State):
                                + str(self.current_condition[3])
         return player1 + '; ' + player2
 
-    def get_possible_moves(self) -> List[str]:
+    def _find_moves(self) -> List[str]:
         """get a list of all possible valid moves of self chopstick game state.
-        Overrides State.get_possible_moves
+        Overrides State._find_moves
         >>> chs1 = ChopstickState()
         >>> chs1.get_possible_moves()
         ['ll', 'lr', 'rl', 'rr']
@@ -93,6 +94,34 @@ class ChopstickState(State):
                     return self.current_condition[3] != 0
         return False
 
+    def _find_over(self) -> bool:
+        """return True if both hands of the current player are dead
+        (% 5 == 0).
+        Overrides State._find_over
+        >>> chs1 = ChopstickState()
+        >>> chs1.current_player = 'p2'
+        >>> chs1.current_condition = [1, 1, 0, 5]
+        >>> chs1.is_over()
+        True
+        """
+        if self.current_player == 'p1':
+            left, right = self.current_condition[0], self.current_condition[1]
+        elif self.current_player == 'p2':
+            left, right = self.current_condition[2], self.current_condition[3]
+        else:
+            return False
+        return left % 5 == 0 and right % 5 == 0
+
+    def _find_key(self) -> Tuple[str, Tuple[int, ...]]:
+        """return the key of self state: the current player and the hands.
+        Overrides State._find_key
+        >>> chs1 = ChopstickState()
+        >>> chs1.current_player = 'p1'
+        >>> chs1.get_key()
+        ('p1', (1, 1, 1, 1))
+        """
+        return self.current_player, tuple(self.current_condition)
+
     def make_move(self, move_to_make: str) -> "ChopstickState":
         """return new current state class after changing the move of the game.
         Overrides State.make_move
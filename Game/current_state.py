@@ -1,23 +1,71 @@
 """module: current_state (SuperClass)
 """
-from typing import Any
+from typing import Any, Optional
 
 
 class State:
     """a class represent the state of class.
     current_player - the player name who is permitted to play this turn.
     current_condition - the current condition of the state of the game
+
+    the moves, whether the game is over, the winner and the key of the state
+    are worked out the first time they are asked for and kept until
+    current_player or current_condition is set again. the attributes are kept
+    in __slots__ rather than a __dict__.
     """
 
-    current_player: str
-    current_condition: str
+    __slots__ = ('_current_player', '_current_condition', '_moves',
+                 '_move_set', '_over', '_winner', '_key')
+    _current_player: str
+    _current_condition: Any
+    _moves: Optional[tuple]
+    _move_set: Optional[frozenset]
+    _over: Optional[bool]
+    _winner: Optional[str]
+    _key: Any
 
     def __init__(self) -> None:
         """initialize the class.
         >>> st1 = State()
         """
-        self.current_player = ''
-        self.current_condition = ''
+        self._clear_cache()
+        self._current_player = ''
+        self._current_condition = ''
+
+    @property
+    def current_player(self) -> str:
+        """the player name who is permitted to play this turn.
+        """
+        return self._current_player
+
+    @current_player.setter
+    def current_player(self, player: str) -> None:
+        """set the current player, forgetting what was worked out before.
+        """
+        self._current_player = player
+        self._clear_cache()
+
+    @property
+    def current_condition(self) -> Any:
+        """the current condition of the state of the game.
+        """
+        return self._current_condition
+
+    @current_condition.setter
+    def current_condition(self, condition: Any) -> None:
+        """set the current condition, forgetting what was worked out before.
+        """
+        self._current_condition = condition
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """forget the moves, result and key worked out for self state.
+        """
+        self._moves = None
+        self._move_set = None
+        self._over = None
+        self._winner = None
+        self._key = None
 
     def __str__(self) -> str:
         """return the string represention of the class.
@@ -34,6 +82,62 @@ class State:
     def get_possible_moves(self) -> list:
         """get a list of all possible moves of self game which are valid.
         """
+        return list(self.get_move_tuple())
+
+    def get_move_tuple(self) -> tuple:
+        """get a tuple of all possible moves of self game, finding them only
+        the first time.
+        """
+        if self._moves is None:
+            self._moves = tuple(self._find_moves())
+        return self._moves
+
+    def get_move_set(self) -> frozenset:
+        """get the set of all possible moves of self game, building it only
+        the first time.
+        """
+        if self._move_set is None:
+            self._move_set = frozenset(self.get_move_tuple())
+        return self._move_set
+
+    def is_over(self) -> bool:
+        """return True if the game is over at self state, finding out only
+        the first time.
+        """
+        if self._over is None:
+            self._over = self._find_over()
+        return self._over
+
+    def get_winner(self) -> Optional[str]:
+        """return the name of the player who has won at self state, or None
+        if nobody has. the player to move when the game is over has lost.
+        """
+        if self._winner is None and self.is_over():
+            self._winner = 'p2' if self.current_player == 'p1' else 'p1'
+        return self._winner
+
+    def get_key(self) -> Any:
+        """return a hashable key of self state, the same for equal states,
+        making it only the first time.
+        """
+        if self._key is None:
+            self._key = self._find_key()
+        return self._key
+
+    def _find_moves(self) -> list:
+        """return a list of all possible moves of self game, for
+        get_move_tuple.
+        """
+        raise NotImplementedError("Must implement a subclass!")
+
+    def _find_over(self) -> bool:
+        """return True if the game is over at self state, for is_over.
+        """
+        raise NotImplementedError("Must implement a subclass!")
+
+    def _find_key(self) -> Any:
+        """return the key of self state, for get_key.
+        """
         raise NotImplementedError("Must implement a subclass!")
 
     def is_valid_move(self, move: Any) -> bool:
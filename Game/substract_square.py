@@ -58,19 +58,14 @@ class SubstractSquare(Game):
         substract number becomes 0
         Overrides Game.is_over
         """
-        if current_state.current_condition == 0:
-            return True
-        return False
+        return current_state.is_over()
 
     def is_winner(self, winner: str) -> bool:
         """return if the winner wins the game.(who cannot substract number any
         more.)
         Overrides Game.is_over
         """
-        if self.is_over(self.current_state) and \
-                winner != self.current_state.current_player:
-            return True
-        return False
+        return self.current_state.get_winner() == winner
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 """module: substract_state(subclass of current_state)
 """
-from typing import List
+from typing import List, Tuple
 from current_state import State
 
 
 class SubstractState(State):
     """a class represent state of the substrat square game, a subclass of State.
     """
+    __slots__ = ()
     current_condition: int
 
     def __init__(self) -> None:
@@ -28,9 +29,9 @@ class SubstractState(State):
         """
         return "Now the substract number is: {}".format(self.current_condition)
 
-    def get_possible_moves(self) -> List[int]:
+    def _find_moves(self) -> List[int]:
         """get a list of all possible valid moves of self substract game state.
-        Overrides State.get_possible_moves
+        Overrides State._find_moves
         >>> sss1 = SubstractState()
         >>> sss1.current_condition = 4
         >>> sss1.get_possible_moves()
@@ -49,9 +50,29 @@ class SubstractState(State):
         >>> sss1.is_valid_move(10)
         False
         """
-        if move in self.get_possible_moves():
-            return True
-        return False
+        try:
+            return move in self.get_move_set()
+        except TypeError:
+            return False
+
+    def _find_over(self) -> bool:
+        """return True if the substract number becomes 0.
+        Overrides State._find_over
+        >>> sss1 = SubstractState()
+        >>> sss1.is_over()
+        True
+        """
+        return self.current_condition == 0
+
+    def _find_key(self) -> Tuple[str, int]:
+        """return the key of self state: the current player and the number.
+        Overrides State._find_key
+        >>> sss1 = SubstractState()
+        >>> sss1.current_player = 'p1'
+        >>> sss1.get_key()
+        ('p1', 0)
+        """
+        return self.current_player, self.current_condition
 
     def make_move(self, move_to_make: int) -> "SubstractState":
         """return new current state class after changing the move of the game.
@@ -13,11 +13,17 @@ from strategy import *
 from typing import Any, Callable
 from subtract_square_game import SubtractSquareGame
 from stonehenge import *
+from stonehenge_bitboard import BitboardStonehengeGame
+from mcts import mcts_strategy, mcts_solver_strategy, parallel_mcts_strategy
+from proof_number import dfpn_strategy
+from lazy_smp import lazy_smp_strategy
+from null_window import mtdf_strategy, pvs_strategy
 
 
 # 'h' should map to Stonehenge.
 playable_games = {'s': SubtractSquareGame,
-                  'h': StonehengeGame}
+                  'h': StonehengeGame,
+                  'hb': BitboardStonehengeGame}
 
 
 # 'mr' should map to your recursive implementation of minimax while
@@ -25,7 +31,18 @@ playable_games = {'s': SubtractSquareGame,
 usable_strategies = {'i': interactive_strategy,
                      'ro': rough_outcome_strategy,
                      'mr': recursive_minimax_strategy,
-                     'mi': iterative_minimax_strategy}
+                     'mi': iterative_minimax_strategy,
+                     'ab': alpha_beta_strategy,
+                     'id': iterative_deepening_strategy,
+                     'dl': depth_limited_strategy,
+                     'mc': mcts_strategy,
+                     'ms': mcts_solver_strategy,
+                     'mp': parallel_mcts_strategy,
+                     'pn': dfpn_strategy,
+                     'pm': parallel_minimax_strategy,
+                     'ls': lazy_smp_strategy,
+                     'pv': pvs_strategy,
+                     'mt': mtdf_strategy}
 
 
 class GameInterface:
@@ -3,7 +3,7 @@ The GameState superclass.
 
 NOTE: You do not have to run python-ta on this file.
 """
-from typing import Any
+from typing import Any, List, Optional
 
 
 class GameState:
@@ -13,12 +13,30 @@ class GameState:
     WIN - score if player is in a winning position
     LOSE - score if player is in a losing position
     DRAW - score if player is in a tied position
+    ranks_moves - whether get_ordered_moves ranks the moves by what they do
+                  in the game, so that searches keep to that order rather
+                  than the one they learn from cutoffs
     p1_turn - whether it is p1's turn or not
+
+    A state never changes once it is made, so what is derived from it (the
+    moves, whether the game is over, the winner and the key) is worked out
+    the first time it is asked for and kept in _moves, _move_set, _over,
+    _winner and _key, which are None until then. States keep their
+    attributes in __slots__ rather than a __dict__, since searches hold many
+    of them at once.
     """
+    __slots__ = ('p1_turn', '_moves', '_move_set', '_over', '_winner',
+                 '_key')
     WIN: int = 1
     LOSE: int = -1
     DRAW: int = 0
+    ranks_moves: bool = False
     p1_turn: bool
+    _moves: Optional[tuple]
+    _move_set: Optional[frozenset]
+    _over: Optional[bool]
+    _winner: Optional[str]
+    _key: Any
 
     def __init__(self, is_p1_turn: bool) -> None:
         """
@@ -27,6 +45,11 @@ class GameState:
 
         """
         self.p1_turn = is_p1_turn
+        self._moves = None
+        self._move_set = None
+        self._over = None
+        self._winner = None
+        self._key = None
 
     def __str__(self) -> str:
         """
@@ -38,8 +61,103 @@ class GameState:
         """
         Return all possible moves that can be applied to this state.
         """
+        return list(self.get_move_tuple())
+
+    def get_move_tuple(self) -> tuple:
+        """
+        Return all possible moves that can be applied to this state as a
+        tuple, finding them only the first time.
+        """
+        if self._moves is None:
+            self._moves = tuple(self._find_moves())
+        return self._moves
+
+    def get_ordered_moves(self) -> tuple:
+        """
+        Return all possible moves that can be applied to this state, the ones
+        most likely to be best first, for searches to try in that order.
+        Games that cannot tell give them in the usual order.
+        """
+        return self.get_move_tuple()
+
+    def get_move_set(self) -> frozenset:
+        """
+        Return the set of all possible moves that can be applied to this
+        state, building it only the first time.
+        """
+        if self._move_set is None:
+            self._move_set = frozenset(self.get_move_tuple())
+        return self._move_set
+
+    def is_over(self) -> bool:
+        """
+        Return whether the game is over at this state, finding out only the
+        first time.
+        """
+        if self._over is None:
+            self._over = self._find_over()
+        return self._over
+
+    def get_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who has won at this state, or None if
+        nobody has. The player to move when the game is over has lost.
+        """
+        if self._winner is None and self.is_over():
+            self._winner = 'p2' if self.p1_turn else 'p1'
+        return self._winner
+
+    def is_decided(self) -> bool:
+        """
+        Return whether the result of the game can no longer change from this
+        state. Games that cannot tell before the end only say so once the
+        game is over.
+        """
+        return self.is_over()
+
+    def get_decided_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who is sure to win from this state, or
+        None if that is not decided (or the game ends in a tie).
+        """
+        return self.get_winner()
+
+    def get_key(self) -> Any:
+        """
+        Return a hashable key that is the same for states of the same
+        value, however they were reached, making it only the first time.
+        """
+        if self._key is None:
+            self._key = self._find_key()
+        return self._key
+
+    def cursor(self) -> 'StateCursor':
+        """
+        Return a StateCursor that starts at this state. Games whose states
+        can be changed in place return their own kind of cursor; the others
+        get a StateStackCursor.
+        """
+        return StateStackCursor(self)
+
+    def _find_moves(self) -> list:
+        """
+        Return all possible moves that can be applied to this state, for
+        get_move_tuple.
+        """
         raise NotImplementedError
 
+    def _find_over(self) -> bool:
+        """
+        Return whether the game is over at this state, for is_over.
+        """
+        return self.get_move_tuple() == ()
+
+    def _find_key(self) -> Any:
+        """
+        Return the key of this state, for get_key.
+        """
+        return type(self).__name__, repr(self)
+
     def get_current_player_name(self) -> str:
         """
         Return 'p1' if the current player is Player 1, and 'p2' if the current
@@ -59,7 +177,10 @@ class GameState:
         """
         Return whether move is a valid move for this GameState.
         """
-        return move in self.get_possible_moves()
+        try:
+            return move in self.get_move_set()
+        except TypeError:
+            return False
 
     def __repr__(self) -> Any:
         """
@@ -87,6 +208,183 @@ class GameState:
         return self.DRAW
 
 
+class StateCursor:
+    """
+    A position of a game that a search walks through in place: push makes a
+    move on it and pop takes back the last move pushed, so no new state is
+    made for each node. Its get_key is the get_key of the GameState it
+    stands for, so a search with a cursor shares its tables with searches
+    over states.
+
+    ranks_moves - whether get_ordered_moves ranks the moves, as for
+                  GameState
+    p1_turn - whether it is p1's turn or not
+    """
+    ranks_moves: bool = False
+    p1_turn: bool
+
+    def push(self, move: Any) -> None:
+        """
+        Make move, which must be valid, on this cursor.
+        """
+        raise NotImplementedError
+
+    def pop(self) -> None:
+        """
+        Take back the last move pushed on this cursor.
+        """
+        raise NotImplementedError
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor.
+        """
+        raise NotImplementedError
+
+    def get_ordered_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor, the ones
+        most likely to be best first.
+        """
+        return self.get_possible_moves()
+
+    def is_over(self) -> bool:
+        """
+        Return whether the game is over at this cursor.
+        """
+        raise NotImplementedError
+
+    def get_key(self) -> Any:
+        """
+        Return the key of the state this cursor stands for.
+        """
+        raise NotImplementedError
+
+    def to_state(self) -> GameState:
+        """
+        Return the GameState this cursor stands for.
+        """
+        raise NotImplementedError
+
+    def is_decided(self) -> bool:
+        """
+        Return whether the result of the game can no longer change from this
+        cursor, which is at least when the game is over.
+        """
+        return self.is_over()
+
+    def get_decided_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who is sure to win from this cursor, or
+        None if that is not decided.
+        """
+        return self.get_winner()
+
+    def get_current_player_name(self) -> str:
+        """
+        Return 'p1' if the current player is Player 1, and 'p2' if the current
+        player is Player 2.
+        """
+        if self.p1_turn:
+            return 'p1'
+        return 'p2'
+
+    def get_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who has won at this cursor, or None if
+        nobody has. The player to move when the game is over has lost.
+        """
+        if not self.is_over():
+            return None
+        return 'p2' if self.p1_turn else 'p1'
+
+
+class StateStackCursor(StateCursor):
+    """
+    A StateCursor for any GameState, which keeps the states it has been
+    through on a stack and still makes a new state for each move.
+
+    states - the states pushed so far, the current one last
+    """
+    states: List[GameState]
+
+    def __init__(self, state: GameState) -> None:
+        """
+        Initialize this cursor at state.
+        """
+        self.states = [state]
+        self.p1_turn = state.p1_turn
+        self.ranks_moves = state.ranks_moves
+
+    def push(self, move: Any) -> None:
+        """
+        Make move on this cursor.
+        Overrides StateCursor.push
+        """
+        self.states.append(self.states[-1].make_move(move))
+        self.p1_turn = self.states[-1].p1_turn
+
+    def pop(self) -> None:
+        """
+        Take back the last move pushed on this cursor.
+        Overrides StateCursor.pop
+        """
+        self.states.pop()
+        self.p1_turn = self.states[-1].p1_turn
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor.
+        Overrides StateCursor.get_possible_moves
+        """
+        return self.states[-1].get_possible_moves()
+
+    def get_ordered_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor, the ones
+        most likely to be best first.
+        Overrides StateCursor.get_ordered_moves
+        """
+        return list(self.states[-1].get_ordered_moves())
+
+    def is_over(self) -> bool:
+        """
+        Return whether the game is over at this cursor.
+        Overrides StateCursor.is_over
+        """
+        return self.states[-1].is_over()
+
+    def is_decided(self) -> bool:
+        """
+        Return whether the result of the game can no longer change from this
+        cursor.
+        Overrides StateCursor.is_decided
+        """
+        return self.states[-1].is_decided()
+
+    def get_decided_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who is sure to win from this cursor, or
+        None if that is not decided.
+        Overrides StateCursor.get_decided_winner
+        """
+        return self.states[-1].get_decided_winner()
+
+    def get_key(self) -> Any:
+        """
+        Return the key of the state this cursor stands for.
+        Overrides StateCursor.get_key
+        """
+        return self.states[-1].get_key()
+
+    def to_state(self) -> GameState:
+        """
+        Return the GameState this cursor stands for.
+        Overrides StateCursor.to_state
+        """
+        return self.states[-1]
+
+
 if __name__ == "__main__":
     from python_ta import check_all
     check_all(config="a2_pyta.txt")
@@ -0,0 +1,251 @@
+"""
+A module for the Lazy SMP strategy.
+
+Lazy SMP runs the same alpha-beta search of the current state in several
+worker processes at once, each trying the moves in a slightly different
+order, and lets them share one transposition table. Whatever one worker
+settles, the others read back instead of searching it again, so together
+they finish sooner than any of them alone without splitting up the work.
+
+The shared table lives in multiprocessing.shared_memory as a fixed array of
+64-bit words. The first word tells the workers to stop; after it, each entry
+is two words: the state's hash XOR the packed data, then the packed data.
+Entries are written and read without locks. An entry torn by two workers
+writing at once no longer XORs back to its hash, so it is just a miss.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from hashlib import blake2b
+from multiprocessing.shared_memory import SharedMemory
+from random import Random
+from typing import Any, List, Optional, Sequence, Tuple
+from game import Game
+from game_state import GameState
+from strategy import get_decided_score, is_decided
+from worker_pool import WORKERS, get_executor
+
+# Entries in the shared transposition table.
+TABLE_ENTRIES = 2 ** 20
+# How many nodes a worker searches between checks of the stop word.
+STOP_CHECK_NODES = 256
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside a worker's search once another worker has finished.
+    """
+    pass
+
+
+class SharedTable:
+    """
+    A transposition table in shared memory that every worker can read and
+    write.
+
+    memory - the shared memory block holding the table
+    words - the block seen as an array of unsigned 64-bit words
+    entries - the number of entries in the table
+    """
+    memory: SharedMemory
+    words: memoryview
+    entries: int
+
+    def __init__(self, entries: int, name: Optional[str] = None) -> None:
+        """
+        Initialize this table with entries entries, making a new block of
+        shared memory (which starts out zeroed, so every entry is empty), or
+        attaching to the block called name if given.
+        """
+        size = 8 * (1 + 2 * entries)
+        if name is None:
+            self.memory = SharedMemory(create=True, size=size)
+        else:
+            self.memory = SharedMemory(name=name)
+        self.words = self.memory.buf[:size].cast('Q')
+        self.entries = entries
+
+    def probe(self, state_hash: int) -> Optional[Tuple[int, int]]:
+        """
+        Return the (score, flag) stored for state_hash, or None if there is
+        no intact entry for it.
+        """
+        index = 1 + 2 * (state_hash % self.entries)
+        data = self.words[index + 1]
+        if self.words[index] ^ data != state_hash:
+            return None
+        return (data & 3) - 1, data >> 2
+
+    def store(self, state_hash: int, score: int, flag: int) -> None:
+        """
+        Record score with flag (EXACT, LOWER or UPPER) for state_hash,
+        replacing whatever its slot held.
+        """
+        index = 1 + 2 * (state_hash % self.entries)
+        data = (score + 1) | (flag << 2)
+        self.words[index] = state_hash ^ data
+        self.words[index + 1] = data
+
+    def is_stopped(self) -> bool:
+        """
+        Return whether the workers were told to stop.
+        """
+        return self.words[0] != 0
+
+    def stop(self) -> None:
+        """
+        Tell the workers to stop.
+        """
+        self.words[0] = 1
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Detach from the shared memory, and free it if unlink is True.
+        """
+        self.words.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def lazy_smp_strategy(game: Game, workers: Optional[int] = None,
+                      entries: int = TABLE_ENTRIES) -> Any:
+    """ Return a move for game by running the same alpha-beta search in
+        workers worker processes (WORKERS when None) sharing a transposition
+        table of entries entries, and taking the move of the first worker
+        to finish. Worker 0 tries the moves in the order of
+        get_ordered_moves and the others in a shuffled order.
+        Cannot provide examples since depend on game.
+    """
+    move_list = game.current_state.get_possible_moves()
+    if move_list == []:
+        return None
+    workers = WORKERS if workers is None else workers
+    table = SharedTable(entries)
+    try:
+        futures = [get_executor(workers).submit(
+            smp_worker, game, table.memory.name, entries, seed)
+                   for seed in range(workers)]
+        finished = wait(futures, return_when=FIRST_COMPLETED)[0]
+        table.stop()
+        wait(futures)
+        results = [future.result() for future in futures
+                   if future in finished and future.result() is not None]
+    finally:
+        table.close(True)
+    return results[0][0] if results != [] else move_list[0]
+
+
+def smp_worker(game: Game, name: str, entries: int,
+               seed: int) -> Optional[Tuple[Any, int]]:
+    """helper function of the Lazy SMP strategy, run in a worker process.
+       Return the best move of game.current_state and its score searching
+       with the shared table called name, or None if told to stop first.
+       seed picks the move order, 0 for the usual order.
+       Cannot provide examples since depend on game.
+    """
+    table = SharedTable(entries, name)
+    rng = None if seed == 0 else Random(seed)
+    try:
+        return smp_root(game, table, rng)
+    except SearchStopped:
+        return None
+    finally:
+        table.close()
+
+
+def smp_root(game: Game, table: SharedTable,
+             rng: Optional[Random]) -> Tuple[Any, int]:
+    """helper function of the Lazy SMP strategy. Return the best move of
+       game.current_state and its score, trying the moves in an order
+       shuffled by rng unless rng is None.
+       Cannot provide examples since depend on game.
+    """
+    state = game.current_state
+    best_move, best_score = None, GameState.LOSE - 1
+    nodes = [0]
+    for move in ordered_moves(state, rng):
+        score = - smp_alpha_beta(game, state.make_move(move), GameState.LOSE,
+                                 - max(best_score, GameState.LOSE), table,
+                                 rng, nodes)
+        if score > best_score:
+            best_move, best_score = move, score
+        if best_score == GameState.WIN:
+            break
+    return best_move, best_score
+
+
+def smp_alpha_beta(game: Game, state: GameState, alpha: int, beta: int,
+                   table: SharedTable, rng: Optional[Random],
+                   nodes: List[int]) -> int:
+    """helper function of the Lazy SMP strategy. Return the score of state
+       for its current player if it lies strictly between alpha and beta,
+       otherwise a bound on the score that is not inside that window.
+       Raise SearchStopped if the workers were told to stop.
+       Cannot provide examples since depend on game.
+    """
+    nodes[0] += 1
+    if nodes[0] % STOP_CHECK_NODES == 0 and table.is_stopped():
+        raise SearchStopped
+    key = state_hash(state)
+    entry = table.probe(key)
+    if entry is not None:
+        score, flag = entry
+        if flag == EXACT or (flag == LOWER and score >= beta) or \
+                (flag == UPPER and score <= alpha):
+            return score
+    if is_decided(game, state):
+        best_score = get_decided_score(game, state)
+    else:
+        best_score = GameState.LOSE - 1
+        for move in ordered_moves(state, rng):
+            score = - smp_alpha_beta(game, state.make_move(move), -beta,
+                                     - max(alpha, best_score), table, rng,
+                                     nodes)
+            if score > best_score:
+                best_score = score
+            if best_score >= beta:
+                break
+    # Scores are -1, 0 or 1, so a bound of -1 or 1 is also the exact score.
+    if alpha < best_score < beta or best_score in (GameState.LOSE,
+                                                    GameState.WIN):
+        table.store(key, best_score, EXACT)
+    elif best_score >= beta:
+        table.store(key, best_score, LOWER)
+    else:
+        table.store(key, best_score, UPPER)
+    return best_score
+
+
+def ordered_moves(state: GameState, rng: Optional[Random]) -> Sequence:
+    """helper function of the Lazy SMP strategy. Return the moves of state,
+       shuffled by rng, or in the order of get_ordered_moves if rng is None.
+       Cannot provide examples since depend on GameState.
+    """
+    if rng is None:
+        return state.get_ordered_moves()
+    move_list = state.get_possible_moves()
+    rng.shuffle(move_list)
+    return move_list
+
+
+def state_hash(state: GameState) -> int:
+    """
+    Return a 64-bit hash of state that is the same in every process and is
+    never 0, so it cannot match an empty entry. States that keep a Zobrist
+    hash use the smaller of it and the hash of their mirror image, which has
+    the same score, and the others hash their repr.
+    """
+    zobrist = getattr(state, 'zobrist', None)
+    if zobrist is not None:
+        return min(zobrist, getattr(state, 'mirror_zobrist', zobrist)) | 1
+    digest = blake2b(repr(state).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') | 1
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,389 @@
+"""
+A module for the Monte Carlo tree search strategy.
+
+Instead of searching every line to the end, Monte Carlo tree search grows a
+tree from the current state one node per playout, picks which line to grow
+with UCT, and scores each new node by playing random moves to the end of the
+game. The more playouts it is given, the stronger the move it picks.
+
+The MCTS-Solver variant also marks nodes whose result is certain: finished
+or decided states, states with a move to a proven loss for the other player,
+and states whose moves all lead to proven results. Proven nodes get no more
+playouts, and the search stops as soon as the root is proven.
+
+The parallel variant spreads the playouts over the shared pool of worker
+processes, either with one independent tree per worker whose root statistics
+are added up ('root'), or with one tree in this process whose playouts run in
+the workers, spread over the tree by virtual loss ('tree'). The tree variant
+sends the workers TREE_BATCH playouts at a time, each as the moves from the
+root to its node, since sending a task costs more than one playout.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from math import log, sqrt
+from random import Random
+from time import time
+from typing import Any, List, Optional
+from game import Game
+from game_state import GameState
+from strategy import get_cursor_score, get_decided_score, is_decided
+from worker_pool import WORKERS, get_executor
+
+# Playouts mcts_strategy runs for each move when it has no time limit.
+PLAYOUTS = 1000
+# Weight of the exploration term in UCT.
+EXPLORATION = sqrt(2)
+# Playouts the tree parallel MCTS sends to a worker in one task.
+TREE_BATCH = 32
+
+
+class MCTSNode:
+    """
+    A node of the Monte Carlo search tree.
+
+    state - the state of the game at this node
+    move - the move that made state from the parent's state
+    parent - the node this node was expanded from, None for the root
+    children - the nodes expanded from this node so far
+    untried_moves - the moves of state that have no node yet
+    visits - the number of playouts that went through this node
+    wins - the total reward of those playouts for the player who made move,
+           1 for a win, 0.5 for a tie and 0 for a loss
+    proven - the certain score of state for the player whose turn it is, or
+             None if it is not known (only used by MCTS-Solver)
+    """
+    state: GameState
+    move: Any
+    parent: Optional["MCTSNode"]
+    children: List["MCTSNode"]
+    untried_moves: list
+    visits: int
+    wins: float
+    proven: Optional[int]
+
+    def __init__(self, state: GameState, move: Any = None,
+                 parent: Optional["MCTSNode"] = None) -> None:
+        """
+        Initialize this node for state, reached from parent through move.
+        """
+        self.state = state
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried_moves = state.get_possible_moves()
+        self.visits = 0
+        self.wins = 0.0
+        self.proven = None
+
+    def uct_child(self, exploration: float) -> "MCTSNode":
+        """
+        Return the child of this node with the highest UCT value, leaving
+        out the children that are proven.
+        """
+        log_visits = log(self.visits)
+        return max([child for child in self.children if child.proven is None],
+                   key=lambda child: child.wins / child.visits +
+                   exploration * sqrt(log_visits / child.visits))
+
+    def most_visited_child(self) -> "MCTSNode":
+        """
+        Return the child of this node that the most playouts went through.
+        """
+        return max(self.children, key=lambda child: child.visits)
+
+
+def mcts_strategy(game: Game, playouts: int = PLAYOUTS,
+                  time_limit: Optional[float] = None,
+                  seed: Optional[int] = None) -> Any:
+    """ Return a move for game by running Monte Carlo tree search from the
+        current state and picking the move the most playouts went through.
+        The search stops after playouts playouts or, when time_limit is
+        given, after time_limit seconds. seed fixes the random playouts.
+        Cannot provide examples since depend on game.
+    """
+    if game.current_state.get_possible_moves() == []:
+        return None
+    deadline = None if time_limit is None else time() + time_limit
+    root = run_mcts(game, game.current_state, playouts, deadline, Random(seed))
+    return root.most_visited_child().move
+
+
+def mcts_solver_strategy(game: Game, playouts: int = PLAYOUTS,
+                         time_limit: Optional[float] = None,
+                         seed: Optional[int] = None) -> Any:
+    """ Return a move for game by running MCTS-Solver from the current state.
+        A move to a proven win is returned as soon as one is found, moves to
+        proven losses are avoided, and otherwise the move the most playouts
+        went through is picked. The search stops after playouts playouts or,
+        when time_limit is given, after time_limit seconds, or once the
+        current state is proven. seed fixes the random playouts.
+        Cannot provide examples since depend on game.
+    """
+    if game.current_state.get_possible_moves() == []:
+        return None
+    deadline = None if time_limit is None else time() + time_limit
+    root = run_mcts(game, game.current_state, playouts, deadline, Random(seed),
+                    True)
+    return solver_child(root).move
+
+
+def parallel_mcts_strategy(game: Game, playouts: int = PLAYOUTS,
+                           time_limit: Optional[float] = None,
+                           seed: Optional[int] = None,
+                           workers: Optional[int] = None,
+                           mode: str = 'root') -> Any:
+    """ Return a move for game by running Monte Carlo tree search on workers
+        worker processes (WORKERS when None) and picking the move the most
+        playouts went through. mode is 'root' for one tree per worker with
+        the root statistics added up, or 'tree' for one shared tree whose
+        playouts run in the workers. The search stops after playouts
+        playouts in total or, when time_limit is given, after time_limit
+        seconds. seed fixes the random playouts.
+        Cannot provide examples since depend on game.
+    """
+    if game.current_state.get_possible_moves() == []:
+        return None
+    if mode not in ('root', 'tree'):
+        raise ValueError("mode must be 'root' or 'tree', not {}".format(mode))
+    workers = WORKERS if workers is None else workers
+    deadline = None if time_limit is None else time() + time_limit
+    rng = Random(seed)
+    executor = get_executor(workers)
+    if mode == 'tree':
+        root = run_tree_parallel_mcts(game, playouts, deadline, rng, executor,
+                                      workers)
+        return root.most_visited_child().move
+    futures = [executor.submit(root_statistics, game,
+                               -(-playouts // workers), deadline,
+                               rng.randrange(2 ** 32))
+               for _ in range(workers)]
+    visits = {}
+    for future in futures:
+        for move, child_visits in future.result().items():
+            visits[move] = visits.get(move, 0) + child_visits
+    return max(visits, key=lambda move: visits[move])
+
+
+def root_statistics(game: Game, playouts: int, deadline: Optional[float],
+                    seed: int) -> dict:
+    """helper function of the root parallel MCTS, run in a worker process.
+       Return a dictionary of how many playouts went through each move of
+       game.current_state in a tree grown by playouts playouts, or until
+       deadline when deadline is not None.
+       Cannot provide examples since depend on game.
+    """
+    root = run_mcts(game, game.current_state, playouts, deadline, Random(seed))
+    return {child.move: child.visits for child in root.children}
+
+
+def run_tree_parallel_mcts(game: Game, playouts: int,
+                           deadline: Optional[float], rng: Random,
+                           executor: Any, workers: int) -> MCTSNode:
+    """helper function of the tree parallel MCTS. Return the root of the tree
+       grown from game.current_state by playouts playouts, or until deadline
+       when deadline is not None, keeping up to workers tasks of TREE_BATCH
+       playouts each running in executor at once. Nodes waiting for a
+       playout hold a virtual loss so the next selections go down other
+       lines.
+       Cannot provide examples since depend on game.
+    """
+    root = MCTSNode(game.current_state)
+    pending = {}
+    started = 0
+    while True:
+        while len(pending) < workers and \
+                wants_playout(root, started, playouts, deadline):
+            nodes = []
+            while len(nodes) < TREE_BATCH and \
+                    wants_playout(root, started, playouts, deadline):
+                node = select_and_expand(game, root, rng)
+                started += 1
+                if is_decided(game, node.state):
+                    back_propagate(node, get_decided_score(game, node.state))
+                else:
+                    add_virtual_loss(node)
+                    nodes.append(node)
+            if nodes != []:
+                pending[executor.submit(
+                    playout_batch, game, root.state,
+                    [node_path(node) for node in nodes],
+                    rng.randrange(2 ** 32))] = nodes
+        if pending == {}:
+            return root
+        finished = wait(pending, return_when=FIRST_COMPLETED)[0]
+        for future in finished:
+            for node, score in zip(pending.pop(future), future.result()):
+                add_reward(node, score)
+
+
+def wants_playout(root: MCTSNode, started: int, playouts: int,
+                  deadline: Optional[float]) -> bool:
+    """helper function of the tree parallel MCTS. Return whether another
+       playout should be started in the tree of root after started of them,
+       when the search stops after playouts playouts, or at deadline when
+       deadline is not None.
+    """
+    return (started < playouts if deadline is None else
+            time() < deadline) or root.children == []
+
+
+def node_path(node: MCTSNode) -> List[Any]:
+    """helper function of the tree parallel MCTS. Return the moves from the
+       root of the tree of node down to node.
+    """
+    path = []
+    while node.parent is not None:
+        path.append(node.move)
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def playout_batch(game: Game, state: GameState, paths: List[List[Any]],
+                  seed: int) -> List[int]:
+    """helper function of the tree parallel MCTS, run in a worker process.
+       Return the score of a random playout from the state each path of
+       moves leads to from state, for the player whose turn it is there.
+       Cannot provide examples since depend on game.
+    """
+    rng = Random(seed)
+    scores = []
+    for path in paths:
+        leaf = state
+        for move in path:
+            leaf = leaf.make_move(move)
+        scores.append(playout(game, leaf, rng))
+    return scores
+
+
+def run_mcts(game: Game, state: GameState, playouts: int,
+             deadline: Optional[float], rng: Random,
+             solver: bool = False) -> MCTSNode:
+    """helper function of the Monte Carlo strategies. Return the root of the
+       tree grown from state by playouts playouts, or by as many as fit
+       before deadline when deadline is not None. When solver is True,
+       proven results are backed up the tree and the search stops once the
+       root is proven.
+       Cannot provide examples since depend on game.
+    """
+    root = MCTSNode(state)
+    done = 0
+    while (done < playouts if deadline is None else time() < deadline) or \
+            root.children == []:
+        if root.proven is not None:
+            break
+        node = select_and_expand(game, root, rng)
+        if solver and is_decided(game, node.state):
+            node.proven = get_decided_score(game, node.state)
+        if node.proven is None:
+            back_propagate(node, playout(game, node.state, rng))
+        else:
+            back_propagate(node, node.proven)
+            back_propagate_proof(node.parent)
+        done += 1
+    return root
+
+
+def select_and_expand(game: Game, root: MCTSNode, rng: Random) -> MCTSNode:
+    """helper function of the Monte Carlo strategies. Walk down the tree from
+       root by UCT and return a new child of the first node that still has
+       untried moves, or the finished node the walk ends at.
+       Cannot provide examples since depend on game.
+    """
+    node = root
+    while node.untried_moves == [] and node.children != []:
+        node = node.uct_child(EXPLORATION)
+    if node.untried_moves != [] and not game.is_over(node.state):
+        move = node.untried_moves.pop(rng.randrange(len(node.untried_moves)))
+        child = MCTSNode(node.state.make_move(move), move, node)
+        node.children.append(child)
+        node = child
+    return node
+
+
+def playout(game: Game, state: GameState, rng: Random) -> int:
+    """helper function of the Monte Carlo strategies. Play random moves from
+       state until the result is decided and return the score of the result
+       for the player whose turn it is at state.
+       Cannot provide examples since depend on game.
+    """
+    if is_decided(game, state):
+        return get_decided_score(game, state)
+    first_player = state.get_current_player_name()
+    # The moves are made in place on a cursor, not on new states.
+    cursor = state.cursor()
+    while not cursor.is_decided():
+        cursor.push(rng.choice(cursor.get_possible_moves()))
+    score = get_cursor_score(cursor)
+    if cursor.get_current_player_name() != first_player:
+        score = -score
+    return score
+
+
+def back_propagate_proof(node: Optional[MCTSNode]) -> None:
+    """helper function of MCTS-Solver. Mark node as proven if one of its
+       children is a proven loss, or if all of its moves are expanded and
+       proven, then do the same for its ancestors until one stays unproven.
+    """
+    while node is not None:
+        if any(child.proven == GameState.LOSE for child in node.children):
+            node.proven = GameState.WIN
+        elif node.untried_moves == [] and \
+                all(child.proven is not None for child in node.children):
+            node.proven = max(-child.proven for child in node.children)
+        else:
+            return
+        node = node.parent
+
+
+def solver_child(root: MCTSNode) -> MCTSNode:
+    """helper function of MCTS-Solver. Return the child of root to move to: a
+       proven loss for the other player if there is one, otherwise the most
+       visited child that is not a proven win for the other player.
+    """
+    for child in root.children:
+        if child.proven == GameState.LOSE:
+            return child
+    safe_children = [child for child in root.children
+                     if child.proven != GameState.WIN]
+    if safe_children == []:
+        return root.most_visited_child()
+    return max(safe_children, key=lambda child: child.visits)
+
+
+def add_virtual_loss(node: MCTSNode) -> None:
+    """helper function of the tree parallel MCTS. Count a playout from node
+       that has not finished yet as a loss in node and all of its ancestors.
+    """
+    while node is not None:
+        node.visits += 1
+        node = node.parent
+
+
+def add_reward(node: MCTSNode, score: int) -> None:
+    """helper function of the tree parallel MCTS. Replace the virtual loss
+       of a finished playout from node, whose score for the player to move at
+       node was score, with its reward in node and all of its ancestors.
+    """
+    while node is not None:
+        node.wins += (1 - score) / 2
+        score = -score
+        node = node.parent
+
+
+def back_propagate(node: MCTSNode, score: int) -> None:
+    """helper function of the Monte Carlo strategies. Record a playout whose
+       score for the player to move at node was score in node and all of its
+       ancestors.
+    """
+    while node is not None:
+        node.visits += 1
+        # wins is kept for the player who moved into node, the other player.
+        node.wins += (1 - score) / 2
+        score = -score
+        node = node.parent
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
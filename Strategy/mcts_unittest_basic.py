@@ -0,0 +1,168 @@
+"""
+A subset of unittests used for testing the Monte Carlo tree search strategies.
+
+Monte Carlo tree search picks its moves from random playouts, so every test
+fixes the random seed and gives the search enough playouts that the expected
+move is found reliably.
+"""
+
+import unittest
+from unittest.mock import patch
+import time
+
+from random import Random
+from game_interface import playable_games, usable_strategies
+from mcts import run_mcts
+mcts_strategy = usable_strategies['mc']
+mcts_solver_strategy = usable_strategies['ms']
+parallel_mcts_strategy = usable_strategies['mp']
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class MCTSUnitTests(unittest.TestCase):
+    def test_mcts_subtract_square_4(self):
+        """
+        Test MCTS on a game of SubtractSquare with a value of 4.
+        The winning move is immediately in sight.
+        """
+        with patch('builtins.input', return_value='4'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = mcts_strategy(game, 200, seed=0)
+        expected_move = game.str_to_move("4")
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling MCTS on a game of SubtractSquare with " +
+                          "a value of {} should result in the move {} " +
+                          "being returned, but {} was returned instead.").format(
+                             4, expected_move, move_chosen
+                         ))
+
+    def test_mcts_stonehenge_one_winning_move(self):
+        """
+        Test MCTS on a game of Stonehenge where there is only 1 winning move
+        that is immediately in sight.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(False)
+
+        moves_to_make = ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = mcts_strategy(game, 300, seed=0)
+        expected_move = game.str_to_move("H")
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling MCTS on a game of Stonehenge with " +
+                          "the following board should return the move {} " +
+                          "but got {} instead.\n{}").format(
+                             expected_move, move_chosen,
+                             str(game.current_state)
+                         ))
+
+    def test_mcts_time_limit(self):
+        """
+        Test MCTS with a time limit on a new game of Stonehenge with a
+        side-length of 4. A legal move should be returned shortly after the
+        time limit runs out.
+        """
+        with patch('builtins.input', return_value='4'):
+            game = StonehengeGame(True)
+
+        start = time.time()
+        move_chosen = mcts_strategy(game, time_limit=0.5, seed=0)
+        elapsed = time.time() - start
+
+        self.assertTrue(game.current_state.is_valid_move(move_chosen),
+                        ("Calling MCTS on a new game of Stonehenge should " +
+                         "return a valid move, but {} was returned " +
+                         "instead.").format(move_chosen))
+        self.assertTrue(elapsed < 1.5,
+                        ("Calling MCTS with a time limit of 0.5 seconds " +
+                         "took {:.2f} seconds.").format(elapsed))
+
+    def test_mcts_solver_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test MCTS-Solver on a game of Stonehenge where there is only 1 winning
+        move that is not immediately in sight. The search should prove the
+        win long before running out of playouts.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['A', 'F', 'D']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = mcts_solver_strategy(game, 100000, seed=0)
+        expected_move = game.str_to_move('E')
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling MCTS-Solver on a game of Stonehenge with " +
+                          "the following board should return the move {} " +
+                          "but got {} instead.\n{}").format(
+                             expected_move, move_chosen,
+                             str(game.current_state)
+                         ))
+
+        root = run_mcts(game, game.current_state, 100000, None, Random(0),
+                        True)
+        self.assertEqual(root.proven, 1,
+                         "MCTS-Solver should prove the board above is a win " +
+                         "for the current player.")
+        self.assertTrue(root.visits < 100000,
+                        "MCTS-Solver should stop once the root is proven.")
+
+    def test_mcts_solver_subtract_square_18(self):
+        """
+        Test MCTS-Solver on a game of SubtractSquare with a value of 18.
+        The chosen move should be 16 or 1, as picking 4 or 9 will result in a
+        loss.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = mcts_solver_strategy(game, 100000, seed=0)
+        expected_moves = [game.str_to_move("1"), game.str_to_move("16")]
+
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling MCTS-Solver on a game of SubtractSquare " +
+                         "with a value of {} should result in a move in {} " +
+                         "being returned, but {} was returned instead.").format(
+                            18, expected_moves, move_chosen
+                         ))
+
+    def test_parallel_mcts_stonehenge_one_winning_move(self):
+        """
+        Test root and tree parallel MCTS on a game of Stonehenge where there
+        is only 1 winning move that is immediately in sight.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(False)
+
+        moves_to_make = ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        expected_move = game.str_to_move("H")
+        for mode in ['root', 'tree']:
+            move_chosen = parallel_mcts_strategy(game, 300, seed=0, workers=2,
+                                                 mode=mode)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling {} parallel MCTS on a game of " +
+                              "Stonehenge with the following board should " +
+                              "return the move {} but got {} " +
+                              "instead.\n{}").format(
+                                 mode, expected_move, move_chosen,
+                                 str(game.current_state)
+                             ))
+
+
+if __name__ == "__main__":
+    unittest.main()
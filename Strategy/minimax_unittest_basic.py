@@ -21,11 +21,19 @@ strategy with Chopsticks either, unless you handle repeated/looping states.
 import unittest
 from unittest.mock import patch
 import inspect
+import time
 
 # Import the student solution
 from game_interface import playable_games, usable_strategies
+import strategy
+from stonehenge import ley_line_margin
 minimax_iterative_strategy = usable_strategies['mi']
 minimax_recursive_strategy = usable_strategies['mr']
+minimax_alpha_beta_strategy = usable_strategies['ab']
+iterative_deepening_strategy = usable_strategies['id']
+depth_limited_strategy = usable_strategies['dl']
+parallel_minimax_strategy = usable_strategies['pm']
+lazy_smp_strategy = usable_strategies['ls']
 StonehengeGame = playable_games['h']
 SubtractSquareGame = playable_games['s']
 
@@ -232,5 +240,325 @@ class MinimaxUnitTests(unittest.TestCase):
                              expected_move, move_chosen, str(new_state)
                          ))
 
+    def test_alpha_beta_subtract_square_matches_recursive(self):
+        """
+        Test alpha-beta minimax on games of SubtractSquare with values from 1
+        to 20. The move chosen should be the same one as recursive minimax.
+        """
+        for value in range(1, 21):
+            with patch('builtins.input', return_value=str(value)):
+                game = SubtractSquareGame(True)
+
+            move_chosen = minimax_alpha_beta_strategy(game)
+            expected_move = minimax_recursive_strategy(game)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling alpha-beta minimax on a game of " +
+                              "SubtractSquare with a value of {} should " +
+                              "result in the move {} being returned, but {} " +
+                              "was returned instead.").format(
+                                 value, expected_move, move_chosen
+                             ))
+
+    def test_alpha_beta_history_keeps_moves(self):
+        """
+        Test alpha-beta minimax on games of SubtractSquare with values from
+        21 to 80, one after another so the killer moves and history of each
+        search reorder the moves of the next. Every search starts with an
+        empty transposition table, and the move chosen should still be the
+        same one as recursive minimax.
+        """
+        for value in range(21, 81):
+            with patch('builtins.input', return_value=str(value)):
+                game = SubtractSquareGame(True)
+
+            strategy.transposition_table.clear()
+            move_chosen = minimax_alpha_beta_strategy(game)
+            expected_move = minimax_recursive_strategy(game)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling alpha-beta minimax on a game of " +
+                              "SubtractSquare with a value of {} should " +
+                              "result in the move {} being returned, but {} " +
+                              "was returned instead.").format(
+                                 value, expected_move, move_chosen
+                             ))
+        self.assertNotEqual(strategy.history_table, {})
+
+    def test_alpha_beta_games_share_table(self):
+        """
+        Test alpha-beta minimax on a new game of Stonehenge with a
+        side-length of 1 and p2 to move, after recursive minimax has filled
+        the shared transposition table with states of SubtractSquare. The
+        states of the two games must not share keys, so p2 should still
+        win.
+        """
+        with patch('builtins.input', return_value='20'):
+            game = SubtractSquareGame(True)
+        minimax_recursive_strategy(game)
+        with patch('builtins.input', return_value='1'):
+            game = StonehengeGame(False)
+
+        score = strategy.alpha_beta_method(game, game.current_state, -1, 1)
+
+        self.assertEqual(score, 1,
+                         ("Calling alpha-beta minimax on a new game of " +
+                          "Stonehenge with a side-length of 1 should find " +
+                          "a win for the player to move, but the score {} " +
+                          "was returned instead.").format(score))
+
+    def test_alpha_beta_stonehenge_one_winning_move(self):
+        """
+        Test alpha-beta minimax on a game of Stonehenge where there is only 1
+        winning move that is immediately in sight.
+        """
+
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(False)
+
+        moves_to_make = ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = minimax_alpha_beta_strategy(game)
+        expected_moves = [game.str_to_move("H")]
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling alpha-beta minimax on a game of Stonehenge" +
+                         " with " +
+                         "the following board should return a move in {} " +
+                         "but got {} instead.\n{}").format(
+                             expected_moves, move_chosen,
+                             STONEHENGE_MINIMAX_BOARD
+                         ))
+
+    def test_alpha_beta_stonehenge_matches_recursive(self):
+        """
+        Test alpha-beta minimax on a new game of Stonehenge with a side-length
+        of 2. The move chosen should be the same one as recursive minimax.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        move_chosen = minimax_alpha_beta_strategy(game)
+        expected_move = minimax_recursive_strategy(game)
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling alpha-beta minimax on a new game of " +
+                          "Stonehenge with a side-length of 2 should return " +
+                          "the move {} but got {} instead.").format(
+                             expected_move, move_chosen
+                         ))
+
+    def test_recursive_subtract_square_large(self):
+        """
+        Test recursive and iterative minimax on a game of SubtractSquare with
+        a value of 120, which is only feasible if repeated states are looked
+        up instead of solved again.
+
+        The chosen move should leave a total from which the other player
+        cannot win.
+        """
+        losing_totals = set()
+        for total in range(121):
+            if all(total - i * i not in losing_totals
+                   for i in range(1, int(total ** 0.5) + 1)):
+                losing_totals.add(total)
+
+        for strategy in [minimax_recursive_strategy,
+                         minimax_iterative_strategy]:
+            with patch('builtins.input', return_value='120'):
+                game = SubtractSquareGame(True)
+
+            move_chosen = strategy(game)
+
+            self.assertTrue(120 - move_chosen in losing_totals,
+                            ("Calling {} on a game of SubtractSquare with " +
+                             "a value of 120 should leave the other player " +
+                             "in a losing position, but {} was " +
+                             "returned.").format(strategy.__name__,
+                                                 move_chosen))
+
+    def test_iterative_deepening_stonehenge_one_winning_move(self):
+        """
+        Test iterative deepening on a game of Stonehenge where there is only 1
+        winning move that is immediately in sight.
+        """
+
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(False)
+
+        moves_to_make = ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = iterative_deepening_strategy(game, 1.0)
+        expected_moves = [game.str_to_move("H")]
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling iterative deepening on a game of " +
+                         "Stonehenge with " +
+                         "the following board should return a move in {} " +
+                         "but got {} instead.\n{}").format(
+                             expected_moves, move_chosen,
+                             STONEHENGE_MINIMAX_BOARD
+                         ))
+
+    def test_iterative_deepening_stonehenge_guessed_win(self):
+        """
+        Test iterative deepening on a game of Stonehenge where the
+        rough_outcome of the state after the move A makes it look like a win
+        at a depth of 1 although A loses. It should keep searching and pick
+        the same winning move as recursive minimax.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['D', 'E']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = iterative_deepening_strategy(game, 1.0)
+        expected_move = minimax_recursive_strategy(game)
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling iterative deepening on a game of " +
+                          "Stonehenge with the following board should " +
+                          "return the move {} but got {} instead.\n" +
+                          "{}").format(expected_move, move_chosen,
+                                       str(game.current_state)))
+
+    def test_iterative_deepening_subtract_square_18(self):
+        """
+        Test iterative deepening on a game of SubtractSquare with a value of
+        18, which it can search to the end within its time budget.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = iterative_deepening_strategy(game, 1.0)
+        expected_moves = [game.str_to_move("1"), game.str_to_move("16")]
+
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling iterative deepening on a game of " +
+                         "SubtractSquare with " +
+                         "a value of {} should result in a move in {} " +
+                         "being returned, but {} was returned instead.").format(
+                            18, expected_moves, move_chosen
+                         ))
+
+    def test_iterative_deepening_time_limit(self):
+        """
+        Test iterative deepening on a new game of Stonehenge with a side-length
+        of 5, which cannot be solved. A legal move should still be returned
+        shortly after the time budget runs out.
+        """
+        with patch('builtins.input', return_value='5'):
+            game = StonehengeGame(True)
+
+        start = time.time()
+        move_chosen = iterative_deepening_strategy(game, 0.5)
+        elapsed = time.time() - start
+
+        self.assertTrue(game.current_state.is_valid_move(move_chosen),
+                        ("Calling iterative deepening on a new game of " +
+                         "Stonehenge should return a valid move, but {} " +
+                         "was returned instead.").format(move_chosen))
+        self.assertTrue(elapsed < 1.5,
+                        ("Calling iterative deepening with a time budget of " +
+                         "0.5 seconds took {:.2f} seconds.").format(elapsed))
+
+    def test_depth_limited_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test depth-limited minimax, scoring the states at its horizon by
+        rough_outcome and by the ley-line margin, on a game of Stonehenge
+        where there is only 1 winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['A', 'F', 'D']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        expected_move = game.str_to_move('E')
+        for evaluate in [None, ley_line_margin]:
+            move_chosen = depth_limited_strategy(game, None, evaluate)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling depth-limited minimax on a game of " +
+                              "Stonehenge with the following board should " +
+                              "return the move {} but got {} instead.\n" +
+                              "{}").format(expected_move, move_chosen,
+                                           str(game.current_state)))
+
+    def test_depth_limited_stonehenge_large(self):
+        """
+        Test depth-limited minimax searching 2 plies ahead on a new game of
+        Stonehenge with a side-length of 5, which is too big to search to the
+        end. It should still return a valid move.
+        """
+        with patch('builtins.input', return_value='5'):
+            game = StonehengeGame(True)
+
+        move_chosen = depth_limited_strategy(game, 2, ley_line_margin)
+
+        self.assertTrue(game.current_state.is_valid_move(move_chosen),
+                        ("Calling depth-limited minimax on a new game of " +
+                         "Stonehenge with a side-length of 5 should return " +
+                         "a valid move, but {} was returned " +
+                         "instead.").format(move_chosen))
+
+    def test_parallel_matches_recursive(self):
+        """
+        Test parallel minimax on games of SubtractSquare with values from 1
+        to 20 and a new game of Stonehenge with a side-length of 2. The move
+        chosen should be the same one as recursive minimax.
+        """
+        games = []
+        for value in range(1, 21):
+            with patch('builtins.input', return_value=str(value)):
+                games.append(SubtractSquareGame(True))
+        with patch('builtins.input', return_value='2'):
+            games.append(StonehengeGame(True))
+
+        for game in games:
+            move_chosen = parallel_minimax_strategy(game, 2)
+            expected_move = minimax_recursive_strategy(game)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling parallel minimax on the following " +
+                              "state should return the move {} but got {} " +
+                              "instead.\n{}").format(
+                                 expected_move, move_chosen,
+                                 str(game.current_state)
+                             ))
+
+    def test_lazy_smp_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test Lazy SMP with 3 workers on a game of Stonehenge where there is
+        only 1 winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['A', 'F', 'D']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        expected_move = game.str_to_move('E')
+        move_chosen = lazy_smp_strategy(game, 3)
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling Lazy SMP on a game of Stonehenge with " +
+                          "the following board should return the move {} " +
+                          "but got {} instead.\n{}").format(
+                             expected_move, move_chosen,
+                             str(game.current_state)
+                         ))
+
 if __name__ == "__main__":
     unittest.main()
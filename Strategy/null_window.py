@@ -0,0 +1,220 @@
+"""
+A module for principal-variation search (NegaScout) and MTD(f).
+
+Every score here is -1, 0 or 1, so whether a state is worth at least some
+score can be settled by a null-window search, an alpha-beta search whose
+window holds no score at all: it can only fail high or fail low, and so
+prunes far more than a search with a wide window.
+
+Principal-variation search searches the first move of each state with the
+full window and only tests the others against it with a null window,
+searching a move again with the full window when it turns out better.
+MTD(f) searches nothing but null windows, moving the window after each
+search towards the bound it returned, which takes at most two searches
+when there are three scores.
+
+Both keep a lower and an upper bound on the score of every state they have
+searched, since a null-window search rarely finds an exact score, and both
+count the nodes they visit so they can be compared with alpha-beta on the
+same states.
+
+Stonehenge and SubtractSquare cannot end in a tie, so every state searched
+to the end scores -1 or 1 and any window is already a null window: the three
+searches then visit the same nodes. Scores of 0 come from searches cut off
+at a depth, which score the states there by their rough_outcome, and that is
+where the null windows save work.
+"""
+from typing import Any, Dict, Optional, Tuple
+from game import Game
+from game_state import GameState, StateCursor
+from strategy import get_cursor_score
+
+# Entries a NullWindowSearcher keeps in its transposition table.
+TABLE_LIMIT = 1000000
+
+ALPHA_BETA = 'alpha-beta'
+PVS = 'pvs'
+MTDF = 'mtdf'
+
+
+class NullWindowSearcher:
+    """
+    A searcher that finds the scores of states by principal-variation
+    search, by MTD(f) or by plain alpha-beta, keeping the bounds it learns in
+    one transposition table.
+
+    table - the (lower bound, upper bound, depth) on the score of the
+            states searched so far for their current player, by state key,
+            where depth is how many plies deep the bounds were searched, or
+            None if they were searched to the end
+    table_limit - the most entries table may hold
+    nodes - the number of nodes visited so far
+    """
+    table: Dict[Any, Tuple[int, int, Optional[int]]]
+    table_limit: int
+    nodes: int
+
+    def __init__(self, table_limit: int = TABLE_LIMIT) -> None:
+        """
+        Initialize this searcher with an empty table of at most table_limit
+        entries.
+        """
+        self.table = {}
+        self.table_limit = table_limit
+        self.nodes = 0
+
+    def solve(self, cursor: StateCursor, method: str,
+              depth: Optional[int] = None) -> int:
+        """
+        Return the score of the position of cursor for its current player
+        found by method, ALPHA_BETA, PVS or MTDF, searching depth plies ahead
+        or to the end if depth is None.
+        """
+        if method == MTDF:
+            return self.mtdf(cursor, GameState.DRAW, depth)
+        return self.search(cursor, GameState.LOSE - 1, GameState.WIN + 1,
+                           depth, method == PVS)
+
+    def mtdf(self, cursor: StateCursor, guess: int,
+             depth: Optional[int] = None) -> int:
+        """
+        Return the score of the position of cursor for its current player,
+        searching depth plies ahead or to the end if depth is None, by
+        null-window searches, the first of them around guess.
+        """
+        lower, upper = GameState.LOSE, GameState.WIN
+        score = guess
+        while lower < upper:
+            beta = score + 1 if score == lower else score
+            score = self.search(cursor, beta - 1, beta, depth, False)
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+        return score
+
+    def search(self, cursor: StateCursor, alpha: int, beta: int,
+               depth: Optional[int], scout: bool) -> int:
+        """
+        Return the score of the position of cursor for its current player if
+        it lies strictly between alpha and beta, otherwise a bound on the
+        score that is not inside that window, leaving cursor where it was
+        when done. The search goes depth plies ahead, or to the end if depth
+        is None, and scores the positions it stops at by their rough_outcome.
+        If scout is True, every move but the first is only tested with a
+        null window unless it turns out better.
+        """
+        self.nodes += 1
+        key = cursor.get_key()
+        lower, upper, searched = self.table.get(
+            key, (GameState.LOSE, GameState.WIN, None))
+        if searched is not None and (depth is None or searched < depth):
+            lower, upper = GameState.LOSE, GameState.WIN
+        if lower >= beta or lower == upper:
+            return lower
+        if upper <= alpha:
+            return upper
+        alpha, beta = max(alpha, lower), min(beta, upper)
+        if cursor.is_decided():
+            best_score = get_cursor_score(cursor)
+            self.store(key, (best_score, best_score, None))
+            return best_score
+        if depth == 0:
+            best_score = cursor.to_state().rough_outcome()
+            self.store(key, (best_score, best_score, 0))
+            return best_score
+        child_depth = None if depth is None else depth - 1
+        best_score = GameState.LOSE - 1
+        for move in cursor.get_ordered_moves():
+            bound = max(alpha, best_score)
+            cursor.push(move)
+            if not scout or best_score < GameState.LOSE or beta - bound <= 1:
+                score = - self.search(cursor, -beta, -bound, child_depth,
+                                      scout)
+            else:
+                score = - self.search(cursor, -bound - 1, -bound, child_depth,
+                                      scout)
+                if bound < score < beta:
+                    score = - self.search(cursor, -beta, -bound, child_depth,
+                                          scout)
+            cursor.pop()
+            if score > best_score:
+                best_score = score
+            if best_score >= beta:
+                break
+        if best_score <= alpha:
+            upper = best_score
+        elif best_score >= beta:
+            lower = best_score
+        else:
+            lower = upper = best_score
+        self.store(key, (lower, upper, depth))
+        return best_score
+
+    def best_move(self, cursor: StateCursor, method: str,
+                  depth: Optional[int] = None) -> Any:
+        """
+        Return a move of the position of cursor with the best score found by
+        method searching depth plies ahead, or to the end if depth is None,
+        testing the moves in the order of get_ordered_moves with a null
+        window each. Return None if there are no moves.
+        """
+        if cursor.get_possible_moves() == []:
+            return None
+        score = self.solve(cursor, method, depth)
+        child_depth = None if depth is None else depth - 1
+        for move in cursor.get_ordered_moves():
+            cursor.push(move)
+            # The score of a best move is -score for the other player, and no
+            # move can give them less.
+            reply = self.search(cursor, -score, -score + 1, child_depth,
+                                False)
+            cursor.pop()
+            if reply <= -score:
+                return move
+        return None
+
+    def store(self, key: Any,
+              bounds: Tuple[int, int, Optional[int]]) -> None:
+        """
+        Record bounds for key in the table, emptying it first when it is
+        full.
+        """
+        if len(self.table) >= self.table_limit:
+            self.table = {}
+        self.table[key] = bounds
+
+
+def solve(game: Game, state: Optional[GameState] = None,
+          method: str = MTDF, depth: Optional[int] = None) -> Tuple[int, int]:
+    """ Return the score of state (game.current_state when None) for the
+        player whose turn it is, found by method (ALPHA_BETA, PVS or MTDF)
+        searching depth plies ahead, or with perfect play if depth is None,
+        and the number of nodes the search visited.
+        Cannot provide examples since depend on game.
+    """
+    if state is None:
+        state = game.current_state
+    searcher = NullWindowSearcher()
+    score = searcher.solve(state.cursor(), method, depth)
+    return score, searcher.nodes
+
+
+def pvs_strategy(game: Game) -> Any:
+    """ Return a move for game with the best score found by principal-variation
+        search.
+        Cannot provide examples since depend on game.
+    """
+    return NullWindowSearcher().best_move(game.current_state.cursor(), PVS)
+
+
+def mtdf_strategy(game: Game) -> Any:
+    """ Return a move for game with the best score found by MTD(f).
+        Cannot provide examples since depend on game.
+    """
+    return NullWindowSearcher().best_move(game.current_state.cursor(), MTDF)
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
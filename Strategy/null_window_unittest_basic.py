@@ -0,0 +1,116 @@
+"""
+A subset of unittests used for testing principal-variation search and MTD(f).
+
+The scores the searches return are checked against the alpha-beta search in
+strategy.py, which searches every line to the end.
+"""
+
+import unittest
+from unittest.mock import patch
+from random import Random
+
+from game_interface import playable_games, usable_strategies
+from null_window import ALPHA_BETA, MTDF, PVS, solve
+from strategy import alpha_beta_method
+pvs_strategy = usable_strategies['pv']
+mtdf_strategy = usable_strategies['mt']
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class NullWindowUnitTests(unittest.TestCase):
+    def test_solve_subtract_square(self):
+        """
+        Test solve with each method on games of SubtractSquare with values
+        from 1 to 60.
+        """
+        for value in range(1, 61):
+            with patch('builtins.input', return_value=str(value)):
+                game = SubtractSquareGame(True)
+
+            expected_score = alpha_beta_method(game, game.current_state, -1, 1)
+            for method in (ALPHA_BETA, PVS, MTDF):
+                score, nodes = solve(game, method=method)
+
+                self.assertEqual(score, expected_score,
+                                 ("Calling solve with {} on a game of " +
+                                  "SubtractSquare with a value of {} should " +
+                                  "return {}, but {} was returned " +
+                                  "instead.").format(
+                                     method, value, expected_score, score
+                                 ))
+                self.assertGreater(nodes, 0)
+
+    def test_solve_stonehenge_openings(self):
+        """
+        Test solve with each method on every state of Stonehenge with a
+        side-length of 2 after one move.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        for move in game.current_state.get_possible_moves():
+            state = game.current_state.make_move(move)
+            expected_score = alpha_beta_method(game, state, -1, 1)
+            for method in (ALPHA_BETA, PVS, MTDF):
+                score = solve(game, state, method)[0]
+
+                self.assertEqual(score, expected_score,
+                                 ("Calling solve with {} on a game of " +
+                                  "Stonehenge with a side-length of 2 after " +
+                                  "the move {} should return {}, but {} was " +
+                                  "returned instead.").format(
+                                     method, move, expected_score, score
+                                 ))
+
+    def test_solve_to_depth_agrees(self):
+        """
+        Test that the three methods give the same score searching 3 plies
+        ahead on random states of Stonehenge with a side-length of 3, whose
+        scores at the search horizon can be 0.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(True)
+
+        rng = Random(0)
+        for _ in range(10):
+            state = game.current_state
+            for _ in range(rng.randrange(4)):
+                state = state.make_move(rng.choice(state.get_possible_moves()))
+            scores = [solve(game, state, method, 3)[0]
+                      for method in (ALPHA_BETA, PVS, MTDF)]
+
+            self.assertEqual(len(set(scores)), 1,
+                             ("Searching 3 plies ahead with alpha-beta, PVS " +
+                              "and MTD(f) gave the scores {} on the " +
+                              "following board.\n{}").format(scores,
+                                                            str(state)))
+
+    def test_strategies_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test the PVS and MTD(f) strategies on a game of Stonehenge where there
+        is only 1 winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['A', 'F', 'D']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        expected_move = game.str_to_move('E')
+        for strategy in (pvs_strategy, mtdf_strategy):
+            move_chosen = strategy(game)
+
+            self.assertEqual(move_chosen, expected_move,
+                             ("Calling {} on a game of Stonehenge with the " +
+                              "following board should return the move {} " +
+                              "but got {} instead.\n{}").format(
+                                 strategy.__name__, expected_move,
+                                 move_chosen, str(game.current_state)
+                             ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+A module for the depth-first proof-number (df-pn) solver.
+
+Proof-number search only asks whether one player, the attacker, can force a
+win. Every node keeps a proof number (how many more nodes must be proven for
+the attacker to win there) and a disproof number (how many for the attacker
+not to win), and the search always grows the most proving node. Depth-first
+proof-number search keeps those numbers in a transposition table instead of
+a tree, so memory stays bounded by the size of the table.
+
+The numbers are stored from the point of view of the player to move at each
+node, as (phi, delta): (proof, disproof) when the attacker is to move and
+(disproof, proof) when the other player is. Then for every node phi is the
+smallest delta of its children and delta is the sum of their phis.
+"""
+from typing import Any, Dict, Optional, Tuple
+from game import Game
+from game_state import GameState
+from strategy import get_decided_score, is_decided, state_key
+
+# Stands for a proof or disproof number that can never reach 0.
+INFINITY = 10 ** 9
+# Entries a DfpnSolver keeps in its transposition table.
+TABLE_LIMIT = 1000000
+
+
+class DfpnSolver:
+    """
+    A df-pn solver that proves whether the attacker can force a win.
+
+    game - the game the states belong to
+    attacker - 'p1' or 'p2', the player trying to win
+    table - (phi, delta) of the states searched so far, by state key
+    table_limit - the most entries table may hold
+    nodes - the number of nodes searched so far
+    """
+    game: Game
+    attacker: str
+    table: Dict[Any, Tuple[int, int]]
+    table_limit: int
+    nodes: int
+
+    def __init__(self, game: Game, attacker: str,
+                 table_limit: int = TABLE_LIMIT) -> None:
+        """
+        Initialize this solver for attacker in game with an empty table of at
+        most table_limit entries.
+        """
+        self.game = game
+        self.attacker = attacker
+        self.table = {}
+        self.table_limit = table_limit
+        self.nodes = 0
+
+    def prove(self, state: GameState) -> bool:
+        """
+        Return whether the attacker can force a win from state.
+        """
+        key = state_key(state)
+        phi, delta = self.look_up(state, key)
+        while phi != 0 and delta != 0:
+            self.search(state, key, INFINITY, INFINITY)
+            phi, delta = self.look_up(state, key)
+        attacker_to_move = state.get_current_player_name() == self.attacker
+        return (phi if attacker_to_move else delta) == 0
+
+    def proving_move(self, state: GameState) -> Any:
+        """
+        Return a move of state after which the attacker can still force a
+        win, or None if there is none.
+        """
+        for move in state.get_move_tuple():
+            if self.prove(state.make_move(move)):
+                return move
+        return None
+
+    def search(self, state: GameState, key: Any, phi_limit: int,
+               delta_limit: int) -> None:
+        """
+        Search below state until its phi reaches phi_limit or its delta
+        reaches delta_limit, and record its new numbers in the table.
+        """
+        self.nodes += 1
+        children = []
+        for move in state.get_ordered_moves():
+            child = state.make_move(move)
+            children.append((child, state_key(child)))
+        while True:
+            numbers = [self.look_up(child, child_key)
+                       for child, child_key in children]
+            phi = min(delta for _, delta in numbers)
+            delta = min(sum(phi for phi, _ in numbers), INFINITY)
+            if phi >= phi_limit or delta >= delta_limit:
+                self.store(key, (phi, delta))
+                return
+            best, second_delta = 0, INFINITY
+            for i in range(1, len(numbers)):
+                if numbers[i][1] < numbers[best][1]:
+                    best, second_delta = i, numbers[best][1]
+                elif numbers[i][1] < second_delta:
+                    second_delta = numbers[i][1]
+            child_phi_limit = min(delta_limit - delta + numbers[best][0],
+                                  INFINITY)
+            child_delta_limit = min(phi_limit, second_delta + 1)
+            self.search(children[best][0], children[best][1],
+                        child_phi_limit, child_delta_limit)
+
+    def look_up(self, state: GameState, key: Any) -> Tuple[int, int]:
+        """
+        Return (phi, delta) of state, from the table if it is there, exactly
+        if the result is decided at state, and (1, 1) otherwise.
+        """
+        if key in self.table:
+            return self.table[key]
+        if not is_decided(self.game, state):
+            return 1, 1
+        mover = state.get_current_player_name()
+        score = get_decided_score(self.game, state)
+        if mover != self.attacker:
+            score = -score
+        # phi and delta are swapped when the attacker is not to move.
+        if (score == GameState.WIN) == (mover == self.attacker):
+            numbers = (0, INFINITY)
+        else:
+            numbers = (INFINITY, 0)
+        self.store(key, numbers)
+        return numbers
+
+    def store(self, key: Any, numbers: Tuple[int, int]) -> None:
+        """
+        Record numbers for key in the table. When the table is full, the
+        entries that are not proven or disproven are dropped first, and the
+        whole table if that is not enough.
+        """
+        if len(self.table) >= self.table_limit:
+            self.table = {old_key: old_numbers for old_key, old_numbers
+                          in self.table.items() if 0 in old_numbers}
+            if len(self.table) >= self.table_limit // 2:
+                self.table = {}
+        self.table[key] = numbers
+
+
+def solve(game: Game, state: Optional[GameState] = None,
+          table_limit: int = TABLE_LIMIT) -> int:
+    """ Return the score of state (game.current_state when None) for the
+        player whose turn it is with perfect play: 1 for a win, -1 for a
+        loss and 0 for a tie.
+        Cannot provide examples since depend on game.
+    """
+    if state is None:
+        state = game.current_state
+    mover = state.get_current_player_name()
+    if DfpnSolver(game, mover, table_limit).prove(state):
+        return GameState.WIN
+    if DfpnSolver(game, other_player(mover), table_limit).prove(state):
+        return GameState.LOSE
+    return GameState.DRAW
+
+
+def dfpn_strategy(game: Game) -> Any:
+    """ Return a move for game by solving the current state with df-pn: a
+        winning move if there is one, otherwise a move that does not lose if
+        there is one, otherwise the first move.
+        Cannot provide examples since depend on game.
+    """
+    state = game.current_state
+    move_list = state.get_possible_moves()
+    if move_list == []:
+        return None
+    mover = state.get_current_player_name()
+    solver = DfpnSolver(game, mover)
+    if solver.prove(state):
+        return solver.proving_move(state)
+    opponent_solver = DfpnSolver(game, other_player(mover))
+    if not opponent_solver.prove(state):
+        for move in move_list:
+            if not opponent_solver.prove(state.make_move(move)):
+                return move
+    return move_list[0]
+
+
+def other_player(player: str) -> str:
+    """
+    Return the name of the player who is not player.
+
+    >>> other_player('p1')
+    'p2'
+    """
+    return 'p2' if player == 'p1' else 'p1'
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,83 @@
+"""
+A subset of unittests used for testing the df-pn solver and strategy.
+
+The scores the solver returns are checked against the alpha-beta search in
+strategy.py, which searches every line to the end.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from game_interface import playable_games, usable_strategies
+from proof_number import solve
+from strategy import alpha_beta_method
+dfpn_strategy = usable_strategies['pn']
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class ProofNumberUnitTests(unittest.TestCase):
+    def test_solve_subtract_square(self):
+        """
+        Test solve on games of SubtractSquare with values from 1 to 60.
+        """
+        for value in range(1, 61):
+            with patch('builtins.input', return_value=str(value)):
+                game = SubtractSquareGame(True)
+
+            score = solve(game)
+            expected_score = alpha_beta_method(game, game.current_state, -1, 1)
+
+            self.assertEqual(score, expected_score,
+                             ("Calling solve on a game of SubtractSquare with " +
+                              "a value of {} should return {}, but {} was " +
+                              "returned instead.").format(
+                                 value, expected_score, score
+                             ))
+
+    def test_solve_stonehenge_openings(self):
+        """
+        Test solve on every state of Stonehenge with a side-length of 2 after
+        one move.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        for move in game.current_state.get_possible_moves():
+            state = game.current_state.make_move(move)
+            score = solve(game, state)
+            expected_score = alpha_beta_method(game, state, -1, 1)
+
+            self.assertEqual(score, expected_score,
+                             ("Calling solve on a game of Stonehenge with a " +
+                              "side-length of 2 after the move {} should " +
+                              "return {}, but {} was returned " +
+                              "instead.").format(move, expected_score, score))
+
+    def test_dfpn_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test the df-pn strategy on a game of Stonehenge where there is only 1
+        winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        moves_to_make = ['A', 'F', 'D']
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = dfpn_strategy(game)
+        expected_move = game.str_to_move('E')
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling the df-pn strategy on a game of Stonehenge " +
+                          "with the following board should return the move " +
+                          "{} but got {} instead.\n{}").format(
+                             expected_move, move_chosen,
+                             str(game.current_state)
+                         ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 """module: stonehenge game, with a class of game and a class of gamestate
 """
-from typing import Any, List
+from random import Random
+from typing import Any, Dict, List, Optional, Tuple
 from game import Game
-from game_state import GameState
+from game_state import GameState, StateCursor
 
 
 class StonehengeGame(Game):
@@ -42,9 +43,7 @@ class StonehengeGame(Game):
         Return whether or not StonehengeGame is over at state.
         Overrides Game.is_over.
         """
-        counting1 = state.current_line[0] / (3 * (self.side_length + 1))
-        counting2 = state.current_line[1] / (3 * (self.side_length + 1))
-        return counting2 >= 0.5 or counting1 >= 0.5
+        return state.is_over()
 
     def is_winner(self, player: str) -> bool:
         """
@@ -53,10 +52,7 @@ class StonehengeGame(Game):
 
         Precondition: player is 'p1' or 'p2'.
         """
-        if self.is_over(self.current_state):
-            if self.current_state.get_current_player_name() != player:
-                return True
-        return False
+        return self.current_state.get_winner() == player
 
     def str_to_move(self, string: str) -> str:
         """
@@ -67,16 +63,201 @@ class StonehengeGame(Game):
         return str(string)
 
 
+class StonehengeTopology:
+    """a class representing the layout of a Stonehenge grid of one side
+    length, which never changes during a game. It is built once for each side
+    length and shared by every state of that size, see get_topology.
+
+    side_length - the side length of the Stonehenge grid
+    grid - the grid of a new game, in the form of StonehengeState.grid
+    letters - the letters of the cells, in order, so cell i is letters[i]
+    index - the cell number of each letter
+    cell_positions - the (row, column) in grid of each cell
+    line_positions - the (row, column) in grid of each ley-line's marker
+    line_cells - the cell numbers on each ley-line
+    line_thresholds - the number of cells of each ley-line that claim it
+    line_masks - the bitmask of the cells on each ley-line
+    lines_through - the ley-lines that go through each cell
+    cell_keys - for p1 and for p2, the random 64-bit Zobrist key of holding
+                each cell
+    line_keys - for p1 and for p2, the Zobrist key of claiming each ley-line
+    turn_key - the Zobrist key of p1 being the one to move
+    base_key - the Zobrist hash of an empty board with p2 to move, which is
+               never 0
+    mirror_cells - the cell each cell becomes when the grid is mirrored, that
+                   is when every row is read backwards
+    mirror_lines - the ley-line each ley-line becomes when the grid is
+                   mirrored. The mirror keeps the rows and swaps the two
+                   diagonal directions.
+    """
+    side_length: int
+    grid: List[List[str]]
+    letters: List[str]
+    index: Dict[str, int]
+    cell_positions: List[Tuple[int, int]]
+    line_positions: List[Tuple[int, int]]
+    line_cells: List[List[int]]
+    line_thresholds: List[int]
+    line_masks: List[int]
+    lines_through: List[List[int]]
+    cell_keys: List[List[int]]
+    line_keys: List[List[int]]
+    turn_key: int
+    base_key: int
+    mirror_cells: List[int]
+    mirror_lines: List[int]
+
+    def __init__(self, side_length: int) -> None:
+        """
+        Initialize StonehengeTopology for a grid of side_length.
+        >>> topology = StonehengeTopology(1)
+        >>> topology.grid
+        [['@', '@'], ['@', 'A', 'B'], ['@', 'C', '@'], ['@']]
+        >>> topology.line_cells
+        [[0, 1], [2], [0], [1, 2], [1], [0, 2]]
+        >>> topology.lines_through[topology.index['A']]
+        [0, 2, 5]
+        >>> topology.mirror_cells, topology.mirror_lines
+        ([1, 0, 2], [0, 1, 4, 5, 2, 3])
+        """
+        self.side_length = side_length
+        self.grid = [['@', '@']]
+        order = ord('A')
+        first_num = 2
+        for i in range(side_length + 1):
+            line = ['@']
+            num = 0
+            if i == side_length:
+                first_num -= 2
+            while num < first_num:
+                line.append(chr(order + num))
+                num += 1
+            order += num
+            first_num += 1
+            if i != side_length - 1:
+                line.append('@')
+            self.grid.append(line)
+        self.grid += [['@'] * side_length]
+
+        self.cell_positions = [
+            (i, j) for i in range(len(self.grid))
+            for j in range(len(self.grid[i])) if self.grid[i][j].isalpha()]
+        self.letters = [self.grid[i][j] for i, j in self.cell_positions]
+        self.index = {letter: k for k, letter in enumerate(self.letters)}
+        lines = self._find_lines()
+        self.line_positions = [marker for marker, _ in lines]
+        self.line_cells = [[self.index[self.grid[i][j]] for i, j in cells]
+                           for _, cells in lines]
+        self.line_thresholds = [(len(cells) + 1) // 2
+                                for cells in self.line_cells]
+        self.line_masks = [sum(1 << cell for cell in cells)
+                           for cells in self.line_cells]
+        self.lines_through = [
+            [line for line in range(len(lines))
+             if cell in self.line_cells[line]]
+            for cell in range(len(self.letters))]
+        # A fixed seed gives the same keys in every process.
+        rng = Random(side_length)
+        self.cell_keys = [[rng.getrandbits(64) for _ in self.letters]
+                          for _ in range(2)]
+        self.line_keys = [[rng.getrandbits(64) for _ in lines]
+                          for _ in range(2)]
+        self.turn_key = rng.getrandbits(64)
+        self.base_key = rng.getrandbits(64) | 1
+        self.mirror_cells = [0] * len(self.letters)
+        for i in range(1, side_length + 2):
+            row = [self.index[letter] for letter in self.grid[i]
+                   if letter.isalpha()]
+            for cell, image in zip(row, reversed(row)):
+                self.mirror_cells[cell] = image
+        line_sets = [frozenset(cells) for cells in self.line_cells]
+        self.mirror_lines = [
+            line_sets.index(frozenset(self.mirror_cells[cell]
+                                      for cell in cells))
+            for cells in self.line_cells]
+
+    def _find_lines(self) -> List[tuple]:
+        """
+        Return each ley-line of the grid as (marker position, cell
+        positions): first the rows, then the lines going down to the left
+        from the top and right markers, then the lines going down to the
+        right from the bottom markers.
+        """
+        grid, last = self.grid, self.side_length + 1
+
+        def pos(i: int, j: int) -> Tuple[int, int]:
+            """Return (i, j) with a negative j counted from the row's end."""
+            return i, j % len(grid[i])
+
+        lines = []
+        for i in range(1, last + 1):
+            lines.append((pos(i, 0), [pos(i, j) for j in range(1, len(grid[i]))
+                                      if grid[i][j].isalpha()]))
+        lines.append(((0, 0), [pos(i, 1) for i in range(1, last)]))
+        for j in range(2, last + 1):
+            marker = (0, 1) if j == 2 else (j - 2, j)
+            lines.append((marker, [pos(i, j) for i in range(j - 1, last)] +
+                          [pos(last, j - 1)]))
+        lines.append((pos(last, -1), [pos(i, i + 1) for i in range(1, last)]))
+        for j in range(2, last + 1):
+            marker = pos(last + 1, -1) if j == 2 else pos(last + 1, -(j - 1))
+            lines.append((marker, [pos(i, i + 2 - j)
+                                   for i in range(j - 1, last)] +
+                          [pos(last, -j)]))
+        return lines
+
+
+# The topology of each side length used so far, see get_topology.
+_topologies: Dict[int, StonehengeTopology] = {}
+
+
+def get_topology(side_length: int) -> StonehengeTopology:
+    """
+    Return the StonehengeTopology of side_length, building it the first time
+    it is asked for.
+    >>> get_topology(2) is get_topology(2)
+    True
+    """
+    if side_length not in _topologies:
+        _topologies[side_length] = StonehengeTopology(side_length)
+    return _topologies[side_length]
+
+
 class StonehengeState(GameState):
     """a class representing a game state of the Stonehenge Game, a subclass
     of GameState.
 
     grid - the list of how stonehenge grid looks like with each specific
-           elements.
+           elements. make_move shares the rows it does not change with the
+           state it was made from, so the rows must never be changed in
+           place.
     current_line - a list showed the number of two players claimed ley lines.
+    topology - the layout of the grid, shared by every state of its size.
+    line_counts - for p1 and for p2, the number of cells they hold on each
+                  ley-line. make_move copies the mover's list and shares the
+                  other, so these lists must never be changed in place.
+    free_cells - the bitmask of the cells nobody has taken yet.
+    zobrist - the 64-bit Zobrist hash of the cells, ley-lines and player to
+              move, which is also the hash of the state.
+    mirror_zobrist - the Zobrist hash of the mirror image of this state.
+
+    _decided is the player sure to win from this state, '' if nobody is yet,
+    or None until get_decided_winner first works it out, and _ordered is the
+    tuple of get_ordered_moves, or None until it is first asked for.
     """
+    __slots__ = ('current_line', 'grid', 'topology', 'line_counts',
+                 'free_cells', 'zobrist', 'mirror_zobrist', '_decided',
+                 '_ordered')
     current_line: List[int]
     grid: List[str]
+    topology: StonehengeTopology
+    line_counts: List[List[int]]
+    free_cells: int
+    zobrist: int
+    mirror_zobrist: int
+    _decided: Optional[str]
+    _ordered: Optional[tuple]
+    ranks_moves: bool = True
 
     def __init__(self, is_p1_turn: bool, grid_length: int) -> None:
         """
@@ -91,23 +272,17 @@ class StonehengeState(GameState):
         """
         GameState.__init__(self, is_p1_turn)
         self.current_line = [0, 0]
-        self.grid = [['@', '@']]
-        order = ord('A')
-        first_num = 2
-        for i in range(grid_length + 1):
-            line = ['@']
-            num = 0
-            if i == grid_length:
-                first_num -= 2
-            while num < first_num:
-                line.append(chr(order + num))
-                num += 1
-            order += num
-            first_num += 1
-            if i != grid_length - 1:
-                line.append('@')
-            self.grid.append(line)
-        self.grid += [['@'] * grid_length]
+        self.topology = get_topology(grid_length)
+        self.grid = [row[:] for row in self.topology.grid]
+        self.line_counts = [[0] * len(self.topology.line_cells)
+                            for _ in range(2)]
+        self.free_cells = (1 << len(self.topology.letters)) - 1
+        self.zobrist = self.topology.base_key
+        if is_p1_turn:
+            self.zobrist ^= self.topology.turn_key
+        self.mirror_zobrist = self.zobrist
+        self._decided = None
+        self._ordered = None
 
     def __str__(self) -> str:
         """
@@ -145,10 +320,10 @@ class StonehengeState(GameState):
         graph += '\n'
         return graph
 
-    def get_possible_moves(self) -> list:
+    def _find_moves(self) -> list:
         """
         Return all possible moves that can be applied to this state.
-        Overrides GameState.get_possible_moves
+        Overrides GameState._find_moves
 
         >>> state = StonehengeState(True, 1)
         >>> state.grid
@@ -156,20 +331,132 @@ class StonehengeState(GameState):
         >>> state.get_possible_moves()
         ['A', 'B', 'C']
         """
-        new_list = []
-        counting1 = self.current_line[0] / (3 * (len(self.grid) - 2))
-        counting2 = self.current_line[1] / (3 * (len(self.grid) - 2))
-        for i in range(1, len(self.grid) - 1):
-            for j in range(1, len(self.grid[i])-1):
-                if self.grid[i][j].isalpha():
-                    new_list.append(self.grid[i][j])
-            if i == len(self.grid) - 3:
-                if self.grid[i][len(self.grid[i]) - 1].isalpha():
-                    new_list.append(self.grid[i][len(self.grid[i]) - 1])
-        if counting1 >= 0.5 or counting2 >= 0.5:
-            new_list = []
+        if self.is_over():
+            return []
+        new_list, free = [], self.free_cells
+        while free:
+            lowest = free & -free
+            new_list.append(self.topology.letters[lowest.bit_length() - 1])
+            free ^= lowest
         return new_list
 
+    def is_valid_move(self, move: Any) -> bool:
+        """
+        Return whether move is a valid move for this StonehengeState, without
+        listing the moves.
+        Overrides GameState.is_valid_move
+
+        >>> state = StonehengeState(True, 1)
+        >>> state.is_valid_move('A'), state.is_valid_move('D')
+        (True, False)
+        >>> state.make_move('B').is_valid_move('B')
+        False
+        """
+        cell = self.topology.index.get(move) if isinstance(move, str) else None
+        return cell is not None and self.free_cells >> cell & 1 == 1 and \
+            not self.is_over()
+
+    def _find_over(self) -> bool:
+        """
+        Return whether a player has claimed at least half of the ley-lines.
+        Overrides GameState._find_over
+
+        >>> StonehengeState(True, 1).make_move('A').is_over()
+        True
+        """
+        return 2 * max(self.current_line) >= len(self.topology.line_cells)
+
+    def get_winning_move(self) -> Optional[str]:
+        """
+        Return a move that wins the game for the current player at once, by
+        claiming enough ley-lines to reach half of them, or None if there is
+        none. Only the counts of cells on each ley-line are looked at.
+
+        >>> state = StonehengeState(True, 2).make_move('A').make_move('G')
+        >>> state.get_winning_move() is None
+        True
+        >>> state = state.make_move('B').make_move('F')
+        >>> state.get_winning_move(), state.make_move('D').is_over()
+        ('D', True)
+        """
+        if self.is_over():
+            return None
+        index = 0 if self.p1_turn else 1
+        cell = winning_cell(self.topology, self.line_counts[index],
+                            self.open_lines(), self.free_cells,
+                            self.current_line[index])
+        return None if cell is None else self.topology.letters[cell]
+
+    def get_ordered_moves(self) -> tuple:
+        """
+        Return all possible moves of this StonehengeState, ranked by what
+        they do to the ley-lines through them, as rank_moves does.
+        Overrides GameState.get_ordered_moves
+
+        >>> state = StonehengeState(True, 2).make_move('A').make_move('G')
+        >>> state.get_ordered_moves()
+        ('D', 'B', 'C', 'E', 'F')
+        """
+        if self._ordered is None:
+            if self.is_over():
+                self._ordered = ()
+            else:
+                index = 0 if self.p1_turn else 1
+                self._ordered = tuple(rank_moves(
+                    self.topology, self.line_counts[index],
+                    self.line_counts[1 - index], self.open_lines(),
+                    self.free_cells))
+        return self._ordered
+
+    def open_lines(self) -> List[int]:
+        """
+        Return the ley-lines nobody has claimed yet.
+
+        >>> StonehengeState(True, 1).make_move('A').open_lines()
+        [1, 3, 4]
+        """
+        return [line for line, (i, j)
+                in enumerate(self.topology.line_positions)
+                if self.grid[i][j] == '@']
+
+    def is_decided(self) -> bool:
+        """
+        Return whether one player is sure to win from this StonehengeState,
+        because the game is over or the current player has a winning move.
+        Overrides GameState.is_decided
+
+        >>> StonehengeState(True, 2).is_decided()
+        False
+        """
+        return self.get_decided_winner() is not None
+
+    def get_decided_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who is sure to win from this
+        StonehengeState, or None if both players can still win.
+        Overrides GameState.get_decided_winner
+
+        >>> state = StonehengeState(True, 2).make_move('A').make_move('G')
+        >>> state.make_move('B').make_move('F').get_decided_winner()
+        'p1'
+        """
+        if self._decided is None:
+            if self.is_over():
+                self._decided = self.get_winner()
+            elif self.get_winning_move() is not None:
+                self._decided = self.get_current_player_name()
+            else:
+                self._decided = ''
+        return self._decided or None
+
+    def _find_key(self) -> Tuple[int, int]:
+        """
+        Return the canonical_key of this StonehengeState, which it shares
+        with its mirror image.
+        Overrides GameState._find_key
+        """
+        return self.canonical_key()
+
     def make_move(self, move: str) -> 'StonehengeState':
         """
         Return the StonehengeState that results from applying move to
@@ -182,94 +469,141 @@ class StonehengeState(GameState):
         [['1', '@'], ['1', '1', 'B'], ['@', 'C', '@'], ['1']]
         >>> new_state.p1_turn
         False
+        >>> new_state.line_counts
+        [[1, 0, 1, 0, 0, 1], [0, 0, 0, 0, 0, 0]]
         """
-        new_state = StonehengeState(self.p1_turn, len(self.grid) - 2)
-        new_state.current_line, new_state.grid = self.current_line[:], [
-            [cell for cell in item] for item in self.grid]
         if not self.is_valid_move(move):
             return self
-        my_pos, index, new_state.p1_turn, ley_line_dic = '1', 0, False, {}
-        if not self.p1_turn:
-            my_pos, index, new_state.p1_turn = '2', 1, True
-        for i in range(len(new_state.grid)):
-            for j in range(len(new_state.grid[i])):
-                new_state.grid[
-                    i][j] = my_pos if new_state.grid[
-                        i][j] == move else new_state.grid[i][j]
-        c1, c2, ley_line_dic['+0+0'], ley_line_dic['-2-1'] \
-            = 0, 0, [], []
-        ley_line_dic['+0+0'].append(new_state.grid[0][0])
-        ley_line_dic['-2-1'].append(new_state.grid[-2][-1])
-        for i in range(1, len(new_state.grid) - 2):
-            ley_line_dic['+0+0'].append(new_state.grid[i][1])
-            ley_line_dic['-2-1'].append(new_state.grid[i][i + 1])
-            c1 = c1 + 1 if new_state.grid[i][1] == my_pos else c1
-            c2 = c2 + 1 if new_state.grid[i][i + 1] == my_pos else c2
-        if c1 >= (len(ley_line_dic['+0+0']) - 1) / 2 and new_state.grid[int(
-                '+0+0'[0:2])][int('+0+0'[2:])] == '@':
-            new_state.grid[int('+0+0'[0:2])][
-                int('+0+0'[2:])], new_state.current_line[
-                    index] = my_pos, new_state.current_line[index] + 1
-        if c2 >= (len(ley_line_dic['-2-1']) - 1) / 2 and new_state.grid[int(
-                '-2-1'[0:2])][int('-2-1'[2:])] == '@':
-            new_state.grid[int('-2-1'[0:2])][
-                int('-2-1'[2:])], new_state.current_line[
-                    index] = my_pos, new_state.current_line[index] + 1
-        name1, name2, c1, c2, ley_line_dic['+0+1'], ley_line_dic['-1-1'] \
-            = '+0+1', '-1-1', 0, 0, [], []
-        ley_line_dic['+0+1'].append(
-            new_state.grid[0][1])
-        ley_line_dic['-1-1'].append(
-            new_state.grid[-1][-1])
-        for j in range(2, len(new_state.grid) - 1):
-            for i in range(j - 1, len(new_state.grid) - 2):
-                ley_line_dic[name1].append(new_state.grid[i][j])
-                ley_line_dic[name2].append(new_state.grid[i][i + 2 - j])
-                c1 = c1 + 1 if new_state.grid[i][j] == my_pos else c1
-                c2 = c2 + 1 if new_state.grid[i][i + 2 - j] == my_pos else c2
-            ley_line_dic[name1].append(
-                new_state.grid[len(new_state.grid) - 2][j - 1])
-            ley_line_dic[name2].append(
-                new_state.grid[len(new_state.grid) - 2][-j])
-            c1 = c1 + 1 if new_state.grid[
-                len(new_state.grid) - 2][j - 1] == my_pos else c1
-            c2 = c2 + 1 if new_state.grid[
-                len(new_state.grid) - 2][-j] == my_pos else c2
-            if c1 >= (len(ley_line_dic[name1]) - 1) / 2 and new_state.grid[int(
-                    name1[0:2])][int(name1[2:])] == '@':
-                new_state.grid[
-                    int(name1[0:2])][int(name1[2:])], new_state.current_line[
-                        index] = my_pos, new_state.current_line[index] + 1
-            if c2 >= (len(ley_line_dic[name2]) - 1) / 2 and new_state.grid[int(
-                    name2[0:2])][int(name2[2:])] == '@':
-                new_state.grid[
-                    int(name2[0:2])][int(name2[2:])], new_state.current_line[
-                        index] = my_pos, new_state.current_line[index] + 1
-            if j + 1 <= len(new_state.grid) - 2:
-                name1, name2 = '+' + str(j - 1) + '+' + str(j + 1), \
-                               '-1' + str(-j)
-                ley_line_dic[name1], ley_line_dic[name2], c1, c2 = \
-                    [], [], 0, 0
-                ley_line_dic[name1].append(new_state.grid[j - 1][j + 1])
-                ley_line_dic[name2].append(new_state.grid[-1][-j])
-        for i in range(1, len(new_state.grid) - 1):
-            name3, c3 = '+' + str(i) + '+' + '0', 0
-            ley_line_dic[name3] = []
-            for j in range(len(new_state.grid[i]) - 1):
-                ley_line_dic[name3].append(new_state.grid[i][j])
-                c3 = c3 + 1 if new_state.grid[i][j] == my_pos else c3
-            if i == len(new_state.grid) - 3:
-                ley_line_dic[name3].append(
-                    new_state.grid[i][len(new_state.grid[i]) - 1])
-                c3 = c3 + 1 if new_state.grid[i][
-                    len(new_state.grid[i]) - 1] == my_pos else c3
-            if c3 >= (len(ley_line_dic[name3]) - 1) / 2 and new_state.grid[int(
-                    name3[0:2])][int(name3[2:])] == '@':
-                new_state.grid[int(name3[0:2])][int(
-                    name3[2:])], new_state.current_line[
-                        index] = my_pos, new_state.current_line[index] + 1
+        topology = self.topology
+        # Skip __init__, which would build a fresh grid only to replace it.
+        new_state = StonehengeState.__new__(StonehengeState)
+        GameState.__init__(new_state, not self.p1_turn)
+        new_state.topology = topology
+        new_state._decided = None
+        new_state._ordered = None
+        new_state.current_line = self.current_line[:]
+        # Only the rows the move changes are copied, the rest are shared.
+        grid = self.grid[:]
+        new_state.grid = grid
+        my_pos, index = ('1', 0) if self.p1_turn else ('2', 1)
+        cell = topology.index[move]
+        i, j = topology.cell_positions[cell]
+        grid[i] = grid[i][:]
+        grid[i][j] = my_pos
+        copied = {i}
+        new_state.free_cells = self.free_cells & ~(1 << cell)
+        keys = topology.cell_keys[index]
+        zobrist = self.zobrist ^ topology.turn_key ^ keys[cell]
+        mirror_zobrist = self.mirror_zobrist ^ topology.turn_key ^ \
+            keys[topology.mirror_cells[cell]]
+        keys = topology.line_keys[index]
+        counts = self.line_counts[index][:]
+        new_state.line_counts = self.line_counts[:]
+        new_state.line_counts[index] = counts
+        for line in topology.lines_through[cell]:
+            counts[line] += 1
+            i, j = topology.line_positions[line]
+            if grid[i][j] == '@' and \
+                    counts[line] >= topology.line_thresholds[line]:
+                if i not in copied:
+                    grid[i] = grid[i][:]
+                    copied.add(i)
+                grid[i][j] = my_pos
+                new_state.current_line[index] += 1
+                zobrist ^= keys[line]
+                mirror_zobrist ^= keys[topology.mirror_lines[line]]
+        new_state.zobrist = zobrist
+        new_state.mirror_zobrist = mirror_zobrist
+        return new_state
+
+    def cursor(self) -> 'StonehengeCursor':
+        """
+        Return a StonehengeCursor that starts at this StonehengeState.
+        Overrides GameState.cursor
+
+        >>> StonehengeState(True, 1).cursor().get_possible_moves()
+        ['A', 'B', 'C']
+        """
+        return StonehengeCursor(self)
+
+    def mirror(self) -> 'StonehengeState':
+        """
+        Return the mirror image of this StonehengeState, with every row of
+        the grid read backwards. It is as good for its current player as
+        this state is.
+
+        >>> state = StonehengeState(True, 2).make_move('A').make_move('E')
+        >>> state.mirror().grid == \\
+        ...     StonehengeState(True, 2).make_move('B').make_move('C').grid
+        True
+        >>> state.mirror().mirror() == state
+        True
+        """
+        topology = self.topology
+        new_state = StonehengeState(self.p1_turn, topology.side_length)
+        new_state.current_line = self.current_line[:]
+        new_state.zobrist = self.mirror_zobrist
+        new_state.mirror_zobrist = self.zobrist
+        for cell, image in enumerate(topology.mirror_cells):
+            if self.free_cells >> cell & 1 == 0:
+                i, j = topology.cell_positions[cell]
+                k, m = topology.cell_positions[image]
+                new_state.grid[k][m] = self.grid[i][j]
+                new_state.free_cells &= ~(1 << image)
+        new_state.line_counts = [[0] * len(counts)
+                                 for counts in self.line_counts]
+        for line, image in enumerate(topology.mirror_lines):
+            i, j = topology.line_positions[line]
+            k, m = topology.line_positions[image]
+            new_state.grid[k][m] = self.grid[i][j]
+            for player in range(2):
+                new_state.line_counts[player][image] = \
+                    self.line_counts[player][line]
         return new_state
 
+    def canonical(self) -> Tuple['StonehengeState', bool]:
+        """
+        Return the representative of this StonehengeState and its mirror
+        image, the one of the two with the smaller hash, and whether that is
+        the mirror image. Moves of the representative are turned back into
+        moves of this state by mirror_move when it is the mirror image.
+
+        >>> state = StonehengeState(True, 2)
+        >>> state.make_move('A').canonical()[0] == \\
+        ...     state.make_move('B').canonical()[0]
+        True
+        """
+        if self.mirror_zobrist < self.zobrist:
+            return self.mirror(), True
+        return self, False
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """
+        Return a key that this StonehengeState shares with its mirror image and
+        with no other state (but for a 128-bit hash collision): the hashes of
+        the state and of its mirror image, smaller first. Unlike canonical,
+        it takes no copy of the grid.
+
+        >>> state = StonehengeState(True, 2)
+        >>> state.make_move('A').canonical_key() == \\
+        ...     state.make_move('B').canonical_key()
+        True
+        """
+        if self.mirror_zobrist < self.zobrist:
+            return self.mirror_zobrist, self.zobrist
+        return self.zobrist, self.mirror_zobrist
+
+    def mirror_move(self, move: str) -> str:
+        """
+        Return the move that move becomes when the grid is mirrored, which is
+        also the move it came from.
+
+        >>> StonehengeState(True, 2).mirror_move('C')
+        'E'
+        """
+        topology = self.topology
+        return topology.letters[topology.mirror_cells[topology.index[move]]]
+
     def __repr__(self) -> Any:
         """
         Return a representation of this StonehengeState (which can be used for
@@ -282,27 +616,419 @@ class StonehengeState(GameState):
         return "Player {} is playing and result as below: {}".format(player,
                                                                      self.grid)
 
+    def __hash__(self) -> int:
+        """
+        Return the Zobrist hash of this StonehengeState.
+
+        >>> state = StonehengeState(True, 2)
+        >>> state_1 = state.make_move('A').make_move('G').make_move('B')
+        >>> state_2 = state.make_move('B').make_move('G').make_move('A')
+        >>> hash(state_1) == hash(state_2)
+        True
+        """
+        return self.zobrist
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other is a StonehengeState with the same grid and the
+        same player to move. Only states with equal hashes are compared
+        cell by cell.
+
+        >>> state = StonehengeState(True, 2)
+        >>> state.make_move('A').make_move('G') == \\
+        ...     state.make_move('G').make_move('A')
+        False
+        >>> state.make_move('A').make_move('G').make_move('B') == \\
+        ...     state.make_move('B').make_move('G').make_move('A')
+        True
+        """
+        return isinstance(other, StonehengeState) and \
+            self.zobrist == other.zobrist and \
+            self.p1_turn == other.p1_turn and self.grid == other.grid
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
-        player can guarantee from state self.
+        player can guarantee from state self, worked out from the ley-line
+        counts by rough_score without making any moves.
         >>> state = StonehengeState(True, 1)
         >>> state = state.make_move('A')
         >>> state.rough_outcome()
         -1
         """
-        move_list = self.get_possible_moves()
-        if move_list == []:
+        if self.is_over():
             return self.LOSE
-        for item in move_list:
-            new_state1 = self.make_move(item)
-            if new_state1.get_possible_moves() == []:
-                return self.WIN
-            for item2 in new_state1.get_possible_moves():
-                new_state2 = new_state1.make_move(item2)
-                if new_state2.get_possible_moves() == []:
-                    return self.LOSE
-        return self.DRAW
+        player = 0 if self.p1_turn else 1
+        return rough_score(self.topology, self.line_counts[player],
+                           self.line_counts[1 - player], self.open_lines(),
+                           self.free_cells, self.current_line[player],
+                           self.current_line[1 - player])
+
+
+def winning_cell(topology: StonehengeTopology, counts: List[int],
+                 open_lines: List[int], free_cells: int,
+                 claimed: int) -> Optional[int]:
+    """
+    Return the first free cell that would bring a player who has claimed
+    claimed ley-lines and holds counts cells on each ley-line up to half of
+    the ley-lines, or None if there is none. open_lines are the ley-lines
+    nobody has claimed yet and free_cells is the bitmask of the free cells.
+
+    >>> topology = get_topology(1)
+    >>> winning_cell(topology, [0] * 6, list(range(6)), 0b111, 0)
+    0
+    """
+    need = (len(topology.line_cells) + 1) // 2 - claimed
+    gains = line_gains(topology, counts, open_lines, free_cells)
+    return min((cell for cell, gain in gains.items() if gain >= need),
+               default=None)
+
+
+def line_gains(topology: StonehengeTopology, counts: List[int],
+               open_lines: List[int], free_cells: int) -> Dict[int, int]:
+    """
+    Return how many of open_lines each free cell of free_cells would claim
+    for a player holding counts cells on each ley-line. Cells that would
+    claim none are left out.
+
+    >>> line_gains(get_topology(1), [0] * 6, [0, 1, 2], 0b110)
+    {1: 1, 2: 1}
+    """
+    gains = {}
+    for line in open_lines:
+        if counts[line] + 1 >= topology.line_thresholds[line]:
+            free = topology.line_masks[line] & free_cells
+            while free:
+                lowest = free & -free
+                cell = lowest.bit_length() - 1
+                gains[cell] = gains.get(cell, 0) + 1
+                free ^= lowest
+    return gains
+
+
+def rough_score(topology: StonehengeTopology, mine: List[int],
+                theirs: List[int], open_lines: List[int], free_cells: int,
+                my_lines: int, their_lines: int) -> int:
+    """
+    Return the rough outcome for a player to move who holds mine cells on
+    each ley-line and has claimed my_lines ley-lines, against theirs and
+    their_lines, when the game is not over: the answer GameState.rough_outcome
+    gives by making every move and every reply, read from the ley-line counts
+    instead. The moves are taken in letter order. The first one that claims
+    half of the ley-lines makes it WIN; before that, the first one after
+    which some reply claims half of the ley-lines for the other player makes
+    it LOSE; otherwise it is DRAW.
+
+    >>> topology = get_topology(1)
+    >>> rough_score(topology, [0] * 6, [0] * 6, list(range(6)), 0b111, 0, 0)
+    1
+    >>> state = StonehengeState(True, 2).make_move('A')
+    >>> rough_score(state.topology, state.line_counts[1],
+    ...             state.line_counts[0], state.open_lines(),
+    ...             state.free_cells, 0, 2)
+    -1
+    """
+    half = (len(topology.line_cells) + 1) // 2
+    my_gains = line_gains(topology, mine, open_lines, free_cells)
+    their_gains = line_gains(topology, theirs, open_lines, free_cells)
+    threats = [cell for cell, gain in their_gains.items()
+               if gain >= half - their_lines]
+    thresholds = topology.line_thresholds
+    is_open = [False] * len(topology.line_cells)
+    for line in open_lines:
+        is_open[line] = True
+    free = free_cells
+    while free:
+        lowest = free & -free
+        cell = lowest.bit_length() - 1
+        free ^= lowest
+        if my_gains.get(cell, 0) >= half - my_lines:
+            return GameState.WIN
+        # Ley-lines this move claims are lost to every reply that would
+        # have claimed them instead.
+        taken = [topology.line_masks[line]
+                 for line in topology.lines_through[cell]
+                 if is_open[line] and mine[line] + 1 >= thresholds[line] and
+                 theirs[line] + 1 >= thresholds[line]]
+        for reply in threats:
+            if reply != cell and their_gains[reply] - sum(
+                    mask >> reply & 1 for mask in taken) >= \
+                    half - their_lines:
+                return GameState.LOSE
+    return GameState.DRAW
+
+
+def rank_moves(topology: StonehengeTopology, mine: List[int],
+               theirs: List[int], open_lines: List[int],
+               free_cells: int) -> List[str]:
+    """
+    Return the free cells of free_cells as moves for a player holding mine
+    cells on each ley-line against theirs, best first: the moves that claim
+    the most ley-lines, then those that block the most ley-lines the other
+    player is one cell from claiming, then those that add to the most
+    ley-lines the player has already started, then those on the most open
+    ley-lines. Ties keep their letter order.
+
+    >>> topology = get_topology(1)
+    >>> rank_moves(topology, [0] * 6, [0, 0, 1, 0, 0, 0], [0, 1, 3, 4, 5],
+    ...            0b110)
+    ['B', 'C']
+    """
+    is_open = [False] * len(topology.line_cells)
+    for line in open_lines:
+        is_open[line] = True
+    thresholds = topology.line_thresholds
+    ranked = []
+    while free_cells:
+        lowest = free_cells & -free_cells
+        cell = lowest.bit_length() - 1
+        claims = blocks = builds = spread = 0
+        for line in topology.lines_through[cell]:
+            if is_open[line]:
+                spread += 1
+                if mine[line] + 1 >= thresholds[line]:
+                    claims += 1
+                elif theirs[line] + 1 >= thresholds[line]:
+                    blocks += 1
+                elif mine[line] > 0:
+                    builds += 1
+        ranked.append((-claims, -blocks, -builds, -spread, cell))
+        free_cells ^= lowest
+    ranked.sort()
+    return [topology.letters[rank[-1]] for rank in ranked]
+
+
+def ley_line_margin(state: StonehengeState) -> float:
+    """
+    Return an evaluation of state, which is not over, for its current player,
+    for searches such as depth_limited_strategy to score the states where they
+    stop: by how many ley-lines the player leads, counting each ley-line a
+    player has claimed and half of each open ley-line a player holds more
+    cells of, as a fraction of all the ley-lines. It is always strictly
+    between LOSE and WIN.
+
+    >>> state = StonehengeState(True, 2).make_move('A')
+    >>> ley_line_margin(state) * len(state.topology.line_cells)
+    -2.5
+    """
+    player = 0 if state.p1_turn else 1
+    mine, theirs = state.line_counts[player], state.line_counts[1 - player]
+    margin = state.current_line[player] - state.current_line[1 - player]
+    for line in state.open_lines():
+        if mine[line] > theirs[line]:
+            margin += 0.5
+        elif mine[line] < theirs[line]:
+            margin -= 0.5
+    return margin / len(state.topology.line_cells)
+
+
+class StonehengeCursor(StateCursor):
+    """a class representing a position of the Stonehenge Game that is changed
+    in place by push and pop, a subclass of StateCursor.
+
+    topology - the layout of the grid
+    cells - the bitmasks of the cells held by p1 and by p2
+    free_cells - the bitmask of the cells nobody has taken yet
+    line_counts - for p1 and for p2, the number of cells they hold on each
+                  ley-line
+    line_owners - 0 or 1 for the ley-lines claimed by p1 or p2, None for the
+                  others
+    current_line - the number of ley-lines p1 and p2 have claimed
+    zobrist - the Zobrist hash of the position, as in StonehengeState
+    mirror_zobrist - the Zobrist hash of the mirror image of the position
+    history - for each move pushed, its cell, the ley-lines it claimed and
+              the two hashes from before it
+    """
+    topology: StonehengeTopology
+    cells: List[int]
+    free_cells: int
+    line_counts: List[List[int]]
+    line_owners: List[Optional[int]]
+    current_line: List[int]
+    zobrist: int
+    mirror_zobrist: int
+    history: List[tuple]
+    ranks_moves: bool = True
+
+    def __init__(self, state: StonehengeState) -> None:
+        """
+        Initialize StonehengeCursor at state.
+        """
+        topology = state.topology
+        self.topology = topology
+        self.p1_turn = state.p1_turn
+        self.free_cells = state.free_cells
+        self.cells = [0, 0]
+        for cell, (i, j) in enumerate(topology.cell_positions):
+            if state.grid[i][j] in ('1', '2'):
+                self.cells[int(state.grid[i][j]) - 1] |= 1 << cell
+        self.line_counts = [state.line_counts[0][:], state.line_counts[1][:]]
+        self.line_owners = [
+            None if state.grid[i][j] == '@' else int(state.grid[i][j]) - 1
+            for i, j in topology.line_positions]
+        self.current_line = state.current_line[:]
+        self.zobrist = state.zobrist
+        self.mirror_zobrist = state.mirror_zobrist
+        self.history = []
+
+    def push(self, move: str) -> None:
+        """
+        Claim the cell move, which must be valid, for the current player.
+        Overrides StateCursor.push
+
+        >>> cursor = StonehengeState(True, 1).cursor()
+        >>> cursor.push('A')
+        >>> cursor.current_line, cursor.is_over(), cursor.get_winner()
+        ([3, 0], True, 'p1')
+        """
+        topology = self.topology
+        cell = topology.index[move]
+        player = 0 if self.p1_turn else 1
+        claimed = []
+        self.history.append((cell, claimed, self.zobrist, self.mirror_zobrist))
+        self.free_cells &= ~(1 << cell)
+        self.cells[player] |= 1 << cell
+        keys = topology.cell_keys[player]
+        self.zobrist ^= topology.turn_key ^ keys[cell]
+        self.mirror_zobrist ^= topology.turn_key ^ \
+            keys[topology.mirror_cells[cell]]
+        keys = topology.line_keys[player]
+        counts, owners = self.line_counts[player], self.line_owners
+        for line in topology.lines_through[cell]:
+            counts[line] += 1
+            if owners[line] is None and \
+                    counts[line] >= topology.line_thresholds[line]:
+                owners[line] = player
+                claimed.append(line)
+                self.zobrist ^= keys[line]
+                self.mirror_zobrist ^= keys[topology.mirror_lines[line]]
+        self.current_line[player] += len(claimed)
+        self.p1_turn = not self.p1_turn
+
+    def pop(self) -> None:
+        """
+        Take back the last move pushed.
+        Overrides StateCursor.pop
+
+        >>> state = StonehengeState(True, 2)
+        >>> cursor = state.cursor()
+        >>> cursor.push('B')
+        >>> cursor.push('E')
+        >>> cursor.pop()
+        >>> cursor.pop()
+        >>> cursor.to_state() == state
+        True
+        """
+        cell, claimed, self.zobrist, self.mirror_zobrist = self.history.pop()
+        self.p1_turn = not self.p1_turn
+        player = 0 if self.p1_turn else 1
+        self.free_cells |= 1 << cell
+        self.cells[player] &= ~(1 << cell)
+        counts = self.line_counts[player]
+        for line in self.topology.lines_through[cell]:
+            counts[line] -= 1
+        for line in claimed:
+            self.line_owners[line] = None
+        self.current_line[player] -= len(claimed)
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor.
+        Overrides StateCursor.get_possible_moves
+        """
+        if self.is_over():
+            return []
+        letters, new_list, free = self.topology.letters, [], self.free_cells
+        while free:
+            lowest = free & -free
+            new_list.append(letters[lowest.bit_length() - 1])
+            free ^= lowest
+        return new_list
+
+    def is_over(self) -> bool:
+        """
+        Return whether a player has claimed at least half of the ley-lines.
+        Overrides StateCursor.is_over
+        """
+        return 2 * max(self.current_line) >= len(self.line_owners)
+
+    def is_decided(self) -> bool:
+        """
+        Return whether one player is sure to win from this cursor.
+        Overrides StateCursor.is_decided
+        """
+        return self.get_decided_winner() is not None
+
+    def get_decided_winner(self) -> Optional[str]:
+        """
+        Return the name of the player who is sure to win from this cursor, or
+        None if both players can still win.
+        Overrides StateCursor.get_decided_winner
+        """
+        if self.is_over():
+            return self.get_winner()
+        index = 0 if self.p1_turn else 1
+        if winning_cell(self.topology, self.line_counts[index],
+                        self.open_lines(), self.free_cells,
+                        self.current_line[index]) is not None:
+            return self.get_current_player_name()
+        return None
+
+    def get_ordered_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor, ranked as
+        rank_moves does.
+        Overrides StateCursor.get_ordered_moves
+        """
+        if self.is_over():
+            return []
+        index = 0 if self.p1_turn else 1
+        return rank_moves(self.topology, self.line_counts[index],
+                          self.line_counts[1 - index], self.open_lines(),
+                          self.free_cells)
+
+    def open_lines(self) -> List[int]:
+        """
+        Return the ley-lines nobody has claimed yet.
+        """
+        return [line for line, owner in enumerate(self.line_owners)
+                if owner is None]
+
+    def get_key(self) -> Tuple[int, int]:
+        """
+        Return the key of the StonehengeState this cursor stands for, its
+        canonical_key.
+        Overrides StateCursor.get_key
+        """
+        if self.mirror_zobrist < self.zobrist:
+            return self.mirror_zobrist, self.zobrist
+        return self.zobrist, self.mirror_zobrist
+
+    def to_state(self) -> StonehengeState:
+        """
+        Return the StonehengeState this cursor stands for.
+        Overrides StateCursor.to_state
+
+        >>> cursor = StonehengeState(True, 1).cursor()
+        >>> cursor.push('C')
+        >>> cursor.to_state() == StonehengeState(True, 1).make_move('C')
+        True
+        """
+        topology = self.topology
+        state = StonehengeState(self.p1_turn, topology.side_length)
+        for cell, (i, j) in enumerate(topology.cell_positions):
+            for player in range(2):
+                if self.cells[player] >> cell & 1:
+                    state.grid[i][j] = str(player + 1)
+        for line, (i, j) in enumerate(topology.line_positions):
+            if self.line_owners[line] is not None:
+                state.grid[i][j] = str(self.line_owners[line] + 1)
+        state.current_line = self.current_line[:]
+        state.line_counts = [self.line_counts[0][:], self.line_counts[1][:]]
+        state.free_cells = self.free_cells
+        state.zobrist = self.zobrist
+        state.mirror_zobrist = self.mirror_zobrist
+        return state
 
 
 if __name__ == "__main__":
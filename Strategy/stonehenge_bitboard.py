@@ -0,0 +1,312 @@
+"""module: a bitboard version of the Stonehenge game state, with the same
+public interface as StonehengeState
+"""
+from typing import Any, List, Tuple
+from game_state import GameState
+from stonehenge import StonehengeGame, StonehengeState, get_topology
+
+
+class BitboardStonehengeState(GameState):
+    """a class representing a game state of the Stonehenge Game whose board is
+    kept as bitmasks, a subclass of GameState. It has the same public
+    interface as StonehengeState.
+
+    side_length - the side length of the Stonehenge grid, whose cells and
+                  ley-lines are numbered as in get_topology(side_length)
+    cells - the bitmasks of the cells claimed by p1 and by p2
+    lines - the bitmasks of the ley-lines claimed by p1 and by p2
+    zobrist - the Zobrist hash of the state, the same as the hash of the
+              StonehengeState with the same board
+    mirror_zobrist - the Zobrist hash of the mirror image of this state
+    """
+    __slots__ = ('side_length', 'cells', 'lines', 'zobrist', 'mirror_zobrist')
+    side_length: int
+    cells: List[int]
+    lines: List[int]
+    zobrist: int
+    mirror_zobrist: int
+
+    def __init__(self, is_p1_turn: bool, grid_length: int) -> None:
+        """
+        Initialize BitboardStonehengeState state and set the current player
+        based on is_p1_turn, with an empty board of side grid_length.
+        extends GameState.__init__
+        >>> state = BitboardStonehengeState(True, 1)
+        >>> state.grid
+        [['@', '@'], ['@', 'A', 'B'], ['@', 'C', '@'], ['@']]
+        """
+        GameState.__init__(self, is_p1_turn)
+        self.side_length = grid_length
+        self.cells = [0, 0]
+        self.lines = [0, 0]
+        topology = get_topology(grid_length)
+        self.zobrist = topology.base_key
+        if is_p1_turn:
+            self.zobrist ^= topology.turn_key
+        self.mirror_zobrist = self.zobrist
+
+    @property
+    def current_line(self) -> List[int]:
+        """
+        Return the number of ley-lines p1 and p2 have claimed.
+        >>> BitboardStonehengeState(True, 1).make_move('A').current_line
+        [3, 0]
+        """
+        return [bin(self.lines[0]).count('1'), bin(self.lines[1]).count('1')]
+
+    @property
+    def grid(self) -> List[List[str]]:
+        """
+        Return the board in the same list of lists form as
+        StonehengeState.grid. The board is built afresh on every read, so it
+        is read-only: changes to the lists returned are not kept.
+        """
+        topology = get_topology(self.side_length)
+        grid = [row[:] for row in topology.grid]
+        for player in range(2):
+            mark = str(player + 1)
+            for mask, positions in ((self.cells[player],
+                                     topology.cell_positions),
+                                    (self.lines[player],
+                                     topology.line_positions)):
+                while mask:
+                    lowest = mask & -mask
+                    row, column = positions[lowest.bit_length() - 1]
+                    grid[row][column] = mark
+                    mask ^= lowest
+        return grid
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the current state of the game,
+        the same as StonehengeState's.
+        Overrides GameState.__str__
+        """
+        state = StonehengeState(self.p1_turn, self.side_length)
+        state.grid = self.grid
+        return str(state)
+
+    def _find_over(self) -> bool:
+        """
+        Return whether a player has claimed at least half of the ley-lines.
+        Overrides GameState._find_over
+
+        >>> BitboardStonehengeState(True, 1).make_move('A').is_over()
+        True
+        """
+        total = 3 * (self.side_length + 1)
+        return 2 * bin(self.lines[0]).count('1') >= total or \
+            2 * bin(self.lines[1]).count('1') >= total
+
+    def _find_moves(self) -> list:
+        """
+        Return all possible moves that can be applied to this state.
+        Overrides GameState._find_moves
+
+        >>> BitboardStonehengeState(True, 1).get_possible_moves()
+        ['A', 'B', 'C']
+        """
+        if self.is_over():
+            return []
+        taken = self.cells[0] | self.cells[1]
+        letters = get_topology(self.side_length).letters
+        return [letters[i] for i in range(len(letters)) if not taken >> i & 1]
+
+    def is_valid_move(self, move: Any) -> bool:
+        """
+        Return whether move is a valid move for this BitboardStonehengeState,
+        without listing the moves.
+        Overrides GameState.is_valid_move
+
+        >>> BitboardStonehengeState(True, 1).is_valid_move('D')
+        False
+        """
+        cell = get_topology(self.side_length).index.get(move) \
+            if isinstance(move, str) else None
+        return cell is not None and \
+            not (self.cells[0] | self.cells[1]) >> cell & 1 and \
+            not self.is_over()
+
+    def make_move(self, move: str) -> 'BitboardStonehengeState':
+        """
+        Return the BitboardStonehengeState that results from applying move to
+        this BitboardStonehengeState, or this state if move is not valid.
+        Overrides GameState.make_move
+
+        >>> state = BitboardStonehengeState(True, 1)
+        >>> new_state = state.make_move('A')
+        >>> new_state.grid
+        [['1', '@'], ['1', '1', 'B'], ['@', 'C', '@'], ['1']]
+        >>> new_state.p1_turn
+        False
+        """
+        if not self.is_valid_move(move):
+            return self
+        topology = get_topology(self.side_length)
+        cell = topology.index[move]
+        player = 0 if self.p1_turn else 1
+        new_state = BitboardStonehengeState(not self.p1_turn, self.side_length)
+        new_state.cells, new_state.lines = self.cells[:], self.lines[:]
+        mine = new_state.cells[player] | 1 << cell
+        new_state.cells[player] = mine
+        keys = topology.cell_keys[player]
+        zobrist = self.zobrist ^ topology.turn_key ^ keys[cell]
+        mirror_zobrist = self.mirror_zobrist ^ topology.turn_key ^ \
+            keys[topology.mirror_cells[cell]]
+        keys = topology.line_keys[player]
+        claimed = self.lines[0] | self.lines[1]
+        for line in topology.lines_through[cell]:
+            if not claimed >> line & 1 and \
+                    bin(mine & topology.line_masks[line]).count('1') >= \
+                    topology.line_thresholds[line]:
+                new_state.lines[player] |= 1 << line
+                zobrist ^= keys[line]
+                mirror_zobrist ^= keys[topology.mirror_lines[line]]
+        new_state.zobrist = zobrist
+        new_state.mirror_zobrist = mirror_zobrist
+        return new_state
+
+    def mirror(self) -> 'BitboardStonehengeState':
+        """
+        Return the mirror image of this BitboardStonehengeState, with every
+        row of the grid read backwards.
+
+        >>> state = BitboardStonehengeState(True, 2).make_move('A')
+        >>> state.mirror() == BitboardStonehengeState(True, 2).make_move('B')
+        True
+        """
+        topology = get_topology(self.side_length)
+        new_state = BitboardStonehengeState(self.p1_turn, self.side_length)
+        new_state.zobrist = self.mirror_zobrist
+        new_state.mirror_zobrist = self.zobrist
+        new_state.cells = [mirror_mask(mask, topology.mirror_cells)
+                           for mask in self.cells]
+        new_state.lines = [mirror_mask(mask, topology.mirror_lines)
+                           for mask in self.lines]
+        return new_state
+
+    def canonical(self) -> Tuple['BitboardStonehengeState', bool]:
+        """
+        Return the representative of this BitboardStonehengeState and its
+        mirror image, and whether that is the mirror image, as
+        StonehengeState.canonical does.
+        """
+        if self.mirror_zobrist < self.zobrist:
+            return self.mirror(), True
+        return self, False
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """
+        Return the pair of the zobrist hashes of this board and of its mirror
+        image, smaller first, so a board and its mirror image get the same
+        key. The masks are never copied, unlike in canonical.
+
+        >>> state = BitboardStonehengeState(True, 2)
+        >>> state.make_move('A').canonical_key() == \\
+        ...     state.make_move('B').canonical_key()
+        True
+        """
+        if self.mirror_zobrist < self.zobrist:
+            return self.mirror_zobrist, self.zobrist
+        return self.zobrist, self.mirror_zobrist
+
+    def _find_key(self) -> Tuple[int, int]:
+        """
+        Return the canonical_key of this BitboardStonehengeState.
+        Overrides GameState._find_key
+        """
+        return self.canonical_key()
+
+    def mirror_move(self, move: str) -> str:
+        """
+        Return the move that move becomes when the grid is mirrored.
+
+        >>> BitboardStonehengeState(True, 2).mirror_move('C')
+        'E'
+        """
+        topology = get_topology(self.side_length)
+        return topology.letters[topology.mirror_cells[topology.index[move]]]
+
+    def __repr__(self) -> Any:
+        """
+        Return a representation of this BitboardStonehengeState (which can be
+        used for equality testing), the same as StonehengeState's.
+        Overrides GameState.__repr__
+        """
+        return StonehengeState.__repr__(self)
+
+    def __hash__(self) -> int:
+        """
+        Return the Zobrist hash of this BitboardStonehengeState.
+
+        >>> hash(BitboardStonehengeState(True, 2).make_move('E')) == \\
+        ...     hash(StonehengeState(True, 2).make_move('E'))
+        True
+        """
+        return self.zobrist
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other is a BitboardStonehengeState with the same board
+        and the same player to move.
+
+        >>> state = BitboardStonehengeState(True, 2)
+        >>> state.make_move('A').make_move('G').make_move('B') == \\
+        ...     state.make_move('B').make_move('G').make_move('A')
+        True
+        """
+        return isinstance(other, BitboardStonehengeState) and \
+            self.zobrist == other.zobrist and \
+            self.p1_turn == other.p1_turn and \
+            self.side_length == other.side_length and \
+            self.cells == other.cells and self.lines == other.lines
+
+    def rough_outcome(self) -> float:
+        """
+        Return an estimate in interval [LOSE, WIN] of best outcome the current
+        player can guarantee from state self.
+        >>> state = BitboardStonehengeState(True, 1)
+        >>> state = state.make_move('A')
+        >>> state.rough_outcome()
+        -1
+        """
+        return GameState.rough_outcome(self)
+
+
+def mirror_mask(mask: int, images: List[int]) -> int:
+    """
+    Return the bitmask with bit images[i] set for every bit i set in mask.
+
+    >>> mirror_mask(0b011, [1, 2, 0])
+    6
+    """
+    result = 0
+    while mask:
+        lowest = mask & -mask
+        result |= 1 << images[lowest.bit_length() - 1]
+        mask ^= lowest
+    return result
+
+
+class BitboardStonehengeGame(StonehengeGame):
+    """a class representing the Stonehenge Game played on
+    BitboardStonehengeStates, a subclass of StonehengeGame.
+    """
+    current_state: BitboardStonehengeState
+
+    def __init__(self, p1_starts: bool) -> None:
+        """
+        Initialize BitboardStonehengeGame, using p1_starts to find who the
+        first player is.
+        extends StonehengeGame.__init__.
+        """
+        StonehengeGame.__init__(self, p1_starts)
+        self.current_state = BitboardStonehengeState(p1_starts,
+                                                     self.side_length)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
@@ -13,10 +13,13 @@ way.
 """
 import unittest
 from unittest.mock import patch
+from random import Random
 
 # Import the student solution
 from game_interface import playable_games
+from game_state import GameState
 StonehengeGame = playable_games['h']
+BitboardStonehengeGame = playable_games['hb']
 
 # Below are some sample Stonehenge boards for use in the unittests
 # The extra \s are escape characters so we can print '\' as expected.
@@ -124,6 +127,28 @@ BOARD_LENGTH_2_AFTER_AGDEF = \
         1   1"""
 
 
+def random_games(side_lengths=range(1, 6), seeds=range(10),
+                 game_class=StonehengeGame):
+    """
+    Yield (state, move) for every state of the random games of game_class
+    played with each of side_lengths and each of seeds, where move is the
+    random move made next, or None once the game is over.
+    """
+    for side_length in side_lengths:
+        with patch('builtins.input', return_value=str(side_length)):
+            game = game_class(True)
+        for seed in seeds:
+            rng = Random(seed)
+            state = game.current_state
+            while True:
+                moves = state.get_possible_moves()
+                move = rng.choice(moves) if moves != [] else None
+                yield state, move
+                if move is None:
+                    break
+                state = state.make_move(move)
+
+
 class StonehengeUnitTests(unittest.TestCase):
     def extract_stonehenge_values(self, state=None, board=""):
         """
@@ -739,6 +764,155 @@ class StonehengeUnitTests(unittest.TestCase):
                           " all moves will result in states where the other " +
                           "player can immediately win but {} was returned " + 
                           "instead.").format(ro))
-        
+
+    def test_rough_outcome_matches_game_state(self):
+        """
+        Test to make sure rough_outcome, read from the ley-line counts, gives
+        the same answer as GameState.rough_outcome, which makes every move and
+        reply, over random games with side-lengths 1 to 5.
+        """
+        for state, _ in random_games():
+            self.assertEqual(state.rough_outcome(),
+                             GameState.rough_outcome(state))
+
+    def test_bitboard_matches_stonehenge(self):
+        """
+        Test to make sure the bitboard version of Stonehenge goes through the
+        same states as Stonehenge over random games with side-lengths 1 to 5.
+        """
+        moves_used = ''
+        games = zip(random_games(),
+                    random_games(game_class=BitboardStonehengeGame))
+        for (state, move), (bitboard_state, bitboard_move) in games:
+            self.assertEqual(str(state), str(bitboard_state),
+                             ("The bitboard state reached after the moves " +
+                              "{} should look like:\n{}\nbut looked " +
+                              "like:\n{}").format(moves_used, str(state),
+                                                  str(bitboard_state)))
+            self.assertEqual(state.get_possible_moves(),
+                             bitboard_state.get_possible_moves())
+            self.assertEqual(state.is_over(), bitboard_state.is_over())
+            self.assertEqual(hash(state), hash(bitboard_state))
+            self.assertEqual(move, bitboard_move)
+            moves_used = '' if move is None else moves_used + move
+
+    def test_hash_and_equality(self):
+        """
+        Test to make sure states reached by different move orders are equal
+        and hash the same exactly when they look the same, over random games
+        with side-lengths 1 to 4.
+        """
+        for side_length in range(1, 5):
+            seen = {}
+            for state, _ in random_games([side_length], range(40)):
+                if repr(state) in seen:
+                    other = seen[repr(state)]
+                    self.assertEqual(state, other)
+                    self.assertEqual(hash(state), hash(other))
+                else:
+                    for other in seen.values():
+                        self.assertNotEqual(state, other)
+                    seen[repr(state)] = state
+
+    def test_cached_properties(self):
+        """
+        Test to make sure the moves, result and key of a state are worked out
+        once and agree with the game, over random games with side-length 3.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(True)
+        for state, _ in random_games([3]):
+            moves = state.get_move_tuple()
+            self.assertIs(moves, state.get_move_tuple())
+            self.assertEqual(list(moves), state.get_possible_moves())
+            self.assertEqual(set(moves), state.get_move_set())
+            self.assertIs(state.get_key(), state.get_key())
+            game.current_state = state
+            for player in ('p1', 'p2'):
+                self.assertEqual(game.is_winner(player),
+                                 state.get_winner() == player)
+            self.assertEqual(game.is_over(state), moves == ())
+            self.assertEqual(state.get_winner() is None, moves != ())
+
+    def test_cursor_matches_make_move(self):
+        """
+        Test to make sure pushing moves on a cursor goes through the same
+        states as make_move, and popping them goes back through them, over
+        random games with side-lengths 1 to 5.
+        """
+        cursor = None
+        for state, move in random_games():
+            if cursor is None:
+                cursor, states = state.cursor(), []
+            states.append(state)
+            self.assertEqual(cursor.to_state(), state)
+            self.assertEqual(cursor.to_state().line_counts, state.line_counts)
+            self.assertEqual(cursor.get_key(), state.get_key())
+            self.assertEqual(cursor.get_possible_moves(),
+                             state.get_possible_moves())
+            self.assertEqual(cursor.get_winner(), state.get_winner())
+            if move is not None:
+                cursor.push(move)
+                continue
+            while len(states) > 1:
+                cursor.pop()
+                states.pop()
+                self.assertEqual(cursor.to_state(), states[-1])
+                self.assertEqual(cursor.get_key(), states[-1].get_key())
+            cursor = None
+
+    def test_decided_states(self):
+        """
+        Test to make sure a state is decided exactly when the game is over or
+        the current player has a move that ends it, over random games with
+        side-lengths 1 to 5, and that its cursor agrees.
+        """
+        for state, _ in random_games():
+            winning_moves = [move for move in state.get_possible_moves()
+                             if state.make_move(move).is_over()]
+            move = state.get_winning_move()
+            if winning_moves == []:
+                self.assertIsNone(move)
+            else:
+                self.assertIn(move, winning_moves)
+            self.assertEqual(state.is_decided(),
+                             state.is_over() or winning_moves != [])
+            self.assertEqual(state.cursor().get_decided_winner(),
+                             state.get_decided_winner())
+
+    def test_ordered_moves(self):
+        """
+        Test to make sure the ordered moves are the possible moves with the
+        moves that claim the most ley-lines first, and that a cursor orders
+        them the same way, over random games with side-lengths 1 to 5.
+        """
+        for state, _ in random_games():
+            ordered = state.get_ordered_moves()
+            self.assertEqual(sorted(ordered), state.get_possible_moves())
+            self.assertEqual(list(ordered),
+                             state.cursor().get_ordered_moves())
+            index = 0 if state.p1_turn else 1
+            claims = [state.make_move(move).current_line[index] -
+                      state.current_line[index] for move in ordered]
+            self.assertEqual(claims, sorted(claims, reverse=True))
+
+    def test_mirror_and_canonical(self):
+        """
+        Test to make sure the mirror image of a state is the state reached by
+        the mirrored moves, and that both have the same canonical form, over
+        random games with side-lengths 1 to 5.
+        """
+        mirrored = None
+        for state, move in random_games():
+            if mirrored is None:
+                mirrored = state
+            self.assertEqual(state.mirror(), mirrored)
+            self.assertEqual(hash(state.mirror()), hash(mirrored))
+            self.assertEqual(state.canonical()[0], mirrored.canonical()[0])
+            self.assertEqual(state.canonical_key(), mirrored.canonical_key())
+            self.assertEqual(state.mirror().line_counts, mirrored.line_counts)
+            mirrored = None if move is None else \
+                mirrored.make_move(state.mirror_move(move))
+
 if __name__ == "__main__":
     unittest.main()
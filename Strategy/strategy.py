@@ -5,8 +5,47 @@ NOTE: Make sure this file adheres to python-ta.
 Adjust the type annotations as needed, and implement both a recursive
 and an iterative version of minimax.
 """
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from game import Game
-from game_state import GameState
+from game_state import GameState, StateCursor
+from worker_pool import get_executor
+
+# Scores of solved states for the player whose turn it is, shared by the
+# minimax strategies. A state reached through different move orders has the
+# same key, so it is only ever solved once.
+transposition_table: Dict[Any, int] = {}
+TABLE_LIMIT = 1000000
+
+# Moves that caused a cutoff at each ply of the current search, newest first,
+# and the cutoff credit each move has earned, which carries over from one
+# search to the next. Both reorder the moves of the alpha-beta and iterative
+# deepening searches.
+killer_moves: Dict[int, List[Any]] = {}
+history_table: Dict[Any, int] = {}
+KILLER_SLOTS = 2
+
+# Seconds iterative_deepening_strategy may spend choosing a move.
+TIME_LIMIT = 2.0
+
+# Scores given at the search horizon are only estimates, so they are scaled
+# into the open interval between LOSE and WIN, where they can never be taken
+# for a proven win or loss.
+ESTIMATE_SCALE = 0.5
+
+# Plies depth_limited_strategy searches ahead on a Stonehenge board of each
+# side-length, so that a move takes at most about a second. Other boards and
+# games are searched DEFAULT_DEPTH plies ahead.
+SEARCH_DEPTHS: Dict[int, int] = {1: 3, 2: 7, 3: 12, 4: 6, 5: 5}
+DEFAULT_DEPTH = 3
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a timed search when its time budget runs out.
+    """
+    pass
+
 
 def interactive_strategy(game: Game) -> str:
     """
@@ -78,6 +117,39 @@ def recursive_minimax_strategy(game: Game) -> str:
     return best_move
 
 
+def parallel_minimax_strategy(game: Game, workers: Any = None) -> str:
+    """ Return a move for game by picking a move which results in a state with
+        the minimax for the opponent, scoring the moves at the same time in
+        the shared pool of worker processes (workers of them, or the default
+        number when None). The move picked is the same one as
+        recursive_minimax_strategy picks.
+        Cannot provide examples since depend on game.
+    """
+    best_move = None
+    move_list = game.current_state.get_possible_moves()
+    executor = get_executor(workers)
+    futures = [executor.submit(score_root_move, game,
+                               game.current_state.make_move(move))
+               for move in move_list]
+    best_move_list = [future.result() for future in futures]
+    if best_move_list != []:
+        index = 0
+        for i in range(len(best_move_list)):
+            if best_move_list[i] == max(best_move_list):
+                index = i
+        best_move = move_list[index]
+    return best_move
+
+
+def score_root_move(game: Game, state: GameState) -> int:
+    """helper function of the parallel minimax, run in a worker process.
+       Return the score of state for the player who moved to it. Each worker
+       keeps its own transposition table between moves.
+       Cannot provide examples since depend on game.
+    """
+    return recursive_method(game, state, None) * (-1)
+
+
 def iterative_minimax_strategy(game: Game) -> str:
     """ Return a move for game by picking a move which results in a state with
         the minimax for the opponent using iterative method.
@@ -86,26 +158,8 @@ def iterative_minimax_strategy(game: Game) -> str:
     best_move = None
     move_list, index1 = [], None
     for item in game.current_state.get_possible_moves():
-        stack_lst, score_lst = [], []
-        node = [game.current_state.make_move(item), [], None]
-        stack_lst.append(node)
-        while stack_lst != []:
-            node = stack_lst.pop()
-            if game.is_over(node[0]):
-                init_state = game.current_state
-                game.current_state = node[0]
-                set_node_score(game, node)
-                score_lst.append(node)
-                game.current_state = init_state
-            elif node[1] == []:
-                new_state1 = node[0]
-                set_node_children(new_state1, node)
-                stack_lst.append(node)
-                append_child_in_stack(stack_lst, node)
-            else:
-                get_node_score_from_children(node, score_lst)
-                score_lst.append(node)
-        move_list.append(score_lst[-1][2] * (-1))
+        new_state1 = game.current_state.make_move(item)
+        move_list.append(iterative_method(game, new_state1) * (-1))
     if move_list != []:
         for i in range(len(move_list)):
             if move_list[i] == max(move_list):
@@ -114,86 +168,443 @@ def iterative_minimax_strategy(game: Game) -> str:
     return best_move
 
 
+def alpha_beta_strategy(game: Game) -> str:
+    """ Return a move for game by picking a move which results in a state with
+        the minimax for the opponent using alpha-beta pruning. The move picked
+        is the same one as recursive_minimax_strategy picks.
+        Cannot provide examples since depend on game.
+    """
+    best_move = None
+    best_score = GameState.LOSE - 1
+    cursor = game.current_state.cursor()
+    start_search()
+    # recursive_minimax_strategy keeps the last of the best moves, so look
+    # at the moves backwards and only replace on a strictly better score.
+    for move in reversed(cursor.get_possible_moves()):
+        cursor.push(move)
+        score = - cursor_alpha_beta(cursor, GameState.LOSE,
+                                    - max(best_score, GameState.LOSE), 1)
+        cursor.pop()
+        if score > best_score:
+            best_score, best_move = score, move
+        if best_score == GameState.WIN:
+            break
+    return best_move
+
+
+def alpha_beta_method(game: Game, state: GameState, alpha: int,
+                      beta: int) -> int:
+    """helper function of the alpha-beta strategy. Return the score of state
+       for its current player if it lies strictly between alpha and beta,
+       otherwise a bound on the score that is not inside that window. The
+       search walks a cursor of state in place.
+       Cannot provide examples since depend on game.
+    """
+    return cursor_alpha_beta(state.cursor(), alpha, beta)
+
+
+def cursor_alpha_beta(cursor: StateCursor, alpha: int, beta: int,
+                      ply: int = 0) -> int:
+    """helper function of the alpha-beta strategy. Return the score of the
+       position of cursor, ply plies below the root of the search, as
+       alpha_beta_method does, leaving cursor where it was when done.
+       The moves are tried in the order of heuristic_order.
+       Cannot provide examples since depend on StateCursor.
+    """
+    key = cursor.get_key()
+    if key in transposition_table:
+        return transposition_table[key]
+    if cursor.is_decided():
+        best_score = get_cursor_score(cursor)
+    else:
+        best_score = GameState.LOSE - 1
+        move_list = heuristic_order(cursor.get_ordered_moves(), ply,
+                                    cursor.ranks_moves)
+        for move in move_list:
+            cursor.push(move)
+            score = - cursor_alpha_beta(cursor, -beta,
+                                        - max(alpha, best_score), ply + 1)
+            cursor.pop()
+            if score > best_score:
+                best_score = score
+            if best_score >= beta:
+                # How deep the rest of the search goes is not known, so the
+                # number of moves left stands in for it.
+                record_cutoff(move, ply, len(move_list) ** 2)
+                break
+    # Scores are -1, 0 or 1, so a bound of -1 or 1 is also the exact score.
+    if alpha < best_score < beta or best_score in (GameState.LOSE,
+                                                    GameState.WIN):
+        store_score(key, best_score)
+    return best_score
+
+
+def iterative_deepening_strategy(game: Game,
+                                 time_limit: float = TIME_LIMIT) -> str:
+    """ Return a move for game by searching one ply deeper at a time until
+        time_limit seconds have passed, then picking the best move of the
+        last search that finished, or of the first that proved a win. States
+        at the search horizon are scored by their rough_outcome, scaled by
+        ESTIMATE_SCALE. The best moves of each search are tried first in the
+        next one.
+        Cannot provide examples since depend on game.
+    """
+    move_list = game.current_state.get_possible_moves()
+    best_move = move_list[0] if move_list != [] else None
+    info = {'deadline': time() + time_limit, 'best_moves': {},
+            'horizon': False, 'depth': 1, 'evaluate': rough_outcome}
+    start_search()
+    depth = 1
+    while move_list != []:
+        info['horizon'], info['depth'] = False, depth
+        try:
+            score, move = depth_limited_root(game, depth, info)
+        except SearchTimeout:
+            break
+        best_move = move
+        # Stop once the search reached the end of every line or proved a win;
+        # an estimate at the horizon never scores as much as a win.
+        if not info['horizon'] or score == GameState.WIN:
+            break
+        depth += 1
+    return best_move
+
+
+def depth_limited_strategy(game: Game, depth: Optional[int] = None,
+                           evaluate: Optional[Callable[[GameState], float]]
+                           = None) -> Any:
+    """ Return a move for game by picking the best move searching depth plies
+        ahead, or when depth is None as many plies as SEARCH_DEPTHS gives for
+        the side-length of game's board (DEFAULT_DEPTH if it gives none).
+        States at the search horizon are scored by evaluate, a function that
+        returns a score in [LOSE, WIN] for the current player of the state
+        it is given, or by their rough_outcome when evaluate is None, scaled
+        by ESTIMATE_SCALE.
+        Cannot provide examples since depend on game.
+    """
+    if game.current_state.get_possible_moves() == []:
+        return None
+    if depth is None:
+        depth = SEARCH_DEPTHS.get(getattr(game, 'side_length', None),
+                                  DEFAULT_DEPTH)
+    info = {'deadline': float('inf'), 'best_moves': {}, 'horizon': False,
+            'depth': depth,
+            'evaluate': rough_outcome if evaluate is None else evaluate}
+    start_search()
+    return depth_limited_root(game, depth, info)[1]
+
+
+def rough_outcome(state: GameState) -> float:
+    """helper function of the iterative deepening and depth-limited
+       strategies, the evaluation they use by default. Return the
+       rough_outcome of state.
+       Cannot provide examples since depend on GameState.
+    """
+    return state.rough_outcome()
+
+
+def depth_limited_root(game: Game, depth: int, info: dict) -> tuple:
+    """helper function of the iterative deepening and depth-limited
+       strategies. Return the best score and move of game.current_state
+       searching depth plies ahead.
+       Cannot provide examples since depend on game.
+    """
+    state = game.current_state
+    best_score, best_move = GameState.LOSE - 1, None
+    key = exact_key(state)
+    for move in order_moves(state, info['best_moves'].get(key), 0):
+        score = - depth_limited_method(game, state.make_move(move), depth - 1,
+                                       GameState.LOSE - 1,
+                                       - max(best_score, GameState.LOSE - 1),
+                                       info)
+        if score > best_score:
+            best_score, best_move = score, move
+        if best_score == GameState.WIN:
+            break
+    info['best_moves'][key] = best_move
+    return best_score, best_move
+
+
+def depth_limited_method(game: Game, state: GameState, depth: int,
+                         alpha: float, beta: float, info: dict) -> float:
+    """helper function of the iterative deepening and depth-limited
+       strategies. Return the score of state for its current player
+       searching depth plies ahead, or a bound on it outside of the window
+       between alpha and beta. States at the horizon are scored by the
+       evaluation in info, scaled by ESTIMATE_SCALE. Raise SearchTimeout
+       once the deadline in info has passed.
+       Cannot provide examples since depend on game.
+    """
+    if time() > info['deadline']:
+        raise SearchTimeout
+    key = state_key(state)
+    if key in transposition_table:
+        return transposition_table[key]
+    if is_decided(game, state):
+        return get_decided_score(game, state)
+    if depth <= 0:
+        info['horizon'] = True
+        return info['evaluate'](state) * ESTIMATE_SCALE
+    best_score, best_move = GameState.LOSE - 1, None
+    # Best moves are kept by exact key, since a mirrored move is another move.
+    key = exact_key(state)
+    for move in order_moves(state, info['best_moves'].get(key),
+                            info['depth'] - depth):
+        score = - depth_limited_method(game, state.make_move(move), depth - 1,
+                                       -beta, - max(alpha, best_score), info)
+        if score > best_score:
+            best_score, best_move = score, move
+        if best_score >= beta:
+            record_cutoff(move, info['depth'] - depth, depth * depth)
+            break
+    info['best_moves'][key] = best_move
+    return best_score
+
+
+def order_moves(state: GameState, best_move: Any, ply: int) -> list:
+    """helper function of the iterative deepening and depth-limited
+       strategies. Return the moves of state, ply plies below the root,
+       starting with best_move, the best move an earlier search found for
+       state, if there is one, and then in the order of heuristic_order.
+       Cannot provide examples since depend on GameState.
+    """
+    move_list = heuristic_order(state.get_ordered_moves(), ply,
+                                state.ranks_moves)
+    if best_move is not None and best_move in move_list:
+        move_list = [best_move] + [move for move in move_list
+                                   if move != best_move]
+    return move_list
+
+
+def heuristic_order(move_list: Sequence, ply: int, ranked: bool) -> list:
+    """helper function of the alpha-beta and iterative deepening strategies.
+       Return move_list, the moves of a state ply plies below the root in
+       the order of get_ordered_moves, with the first of them still first,
+       then the killer moves at ply that are among them, then the rest. The
+       rest keep their order if ranked, that is if the state ranks its own
+       moves, and otherwise go by their credit in the history table, most
+       first, moves with the same credit keeping their order.
+
+       >>> killer_moves.clear()
+       >>> history_table.clear()
+       >>> record_cutoff(3, 1, 4)
+       >>> record_cutoff(4, 2, 9)
+       >>> heuristic_order([1, 2, 3, 4], 1, False)
+       [1, 3, 4, 2]
+       >>> heuristic_order([1, 2, 3, 4], 2, True)
+       [1, 4, 2, 3]
+    """
+    if len(move_list) < 3:
+        return list(move_list)
+    first = move_list[0]
+    killers = [move for move in killer_moves.get(ply, [])
+               if move != first and move in move_list]
+    rest = [move for move in move_list[1:] if move not in killers]
+    if not ranked:
+        rest.sort(key=lambda move: - history_table.get(move, 0))
+    return [first] + killers + rest
+
+
+def record_cutoff(move: Any, ply: int, credit: int) -> None:
+    """helper function of the alpha-beta and iterative deepening strategies.
+       Record that move caused a cutoff ply plies below the root: make it the
+       newest killer move at ply, keeping KILLER_SLOTS of them, and add credit
+       to its history.
+    """
+    killers = killer_moves.setdefault(ply, [])
+    if move in killers:
+        killers.remove(move)
+    killers.insert(0, move)
+    del killers[KILLER_SLOTS:]
+    history_table[move] = history_table.get(move, 0) + credit
+
+
+def start_search() -> None:
+    """helper function of the alpha-beta and iterative deepening strategies.
+       Forget the killer moves of the last search and halve the history
+       credit of every move, so that cutoffs from earlier turns count for
+       less than new ones.
+
+       >>> history_table.clear()
+       >>> history_table.update({'A': 5, 'B': 1})
+       >>> start_search()
+       >>> history_table
+       {'A': 2}
+    """
+    killer_moves.clear()
+    for move in list(history_table):
+        history_table[move] //= 2
+        if history_table[move] == 0:
+            del history_table[move]
+
+
 def recursive_method(game: Game, state: GameState, move: str) -> int:
     """helper function of the recursion minimax. Return the best score after
        make the move operation of the game.state.
        Cannot provide examples since depend on game.
     """
-    score = -1
     score_list = []
     move = move
-    if game.is_over(state):
-        current_player = state.get_current_player_name()
-        if current_player == 'p1':
-            oppo_player = 'p2'
-        else:
-            oppo_player = 'p1'
-        init_state = game.current_state
-        game.current_state = state
-        if game.is_winner(current_player):
-            score = 1
-        elif game.is_winner(oppo_player):
-            score = -1
-        else:
-            score = 0
-        game.current_state = init_state
+    key = state_key(state)
+    if key in transposition_table:
+        return transposition_table[key]
+    if is_decided(game, state):
+        score = get_decided_score(game, state)
     else:
-        for moves in state.get_possible_moves():
+        for moves in state.get_move_tuple():
             state1 = state.make_move(moves)
             new_score = - recursive_method(game, state1, moves)
             score_list.append(new_score)
         score = max(score_list)
+    store_score(key, score)
     return score
 
 
-def set_node_score(game: Game, node: list) -> None:
-    """helper function of the iterative minimax.
-       set the node 's score depending on who is the current winner of the
-       game.
+def get_terminal_score(game: Game, state: GameState) -> int:
+    """helper function of the minimax strategies. Return the score of the
+       finished state for the player whose turn it is at state: 1 if that
+       player won, -1 if the other player won and 0 for a tie.
        Cannot provide examples since depend on game.
     """
-    if node[0].get_current_player_name() == 'p1':
+    current_player = state.get_current_player_name()
+    if current_player == 'p1':
         oppo_player = 'p2'
     else:
         oppo_player = 'p1'
-    if game.is_winner(node[0].get_current_player_name()):
-        node[2] = 1
+    init_state = game.current_state
+    game.current_state = state
+    if game.is_winner(current_player):
+        score = 1
     elif game.is_winner(oppo_player):
-        node[2] = -1
+        score = -1
     else:
-        node[2] = 0
+        score = 0
+    game.current_state = init_state
+    return score
+
+
+def is_decided(game: Game, state: GameState) -> bool:
+    """helper function of the minimax strategies. Return whether the result
+       of the game can no longer change from state, because the game is over
+       or state already knows who will win, so a search need not look past
+       state.
+       Cannot provide examples since depend on game.
+    """
+    return game.is_over(state) or state.is_decided()
 
 
-def set_node_children(new_state1: GameState, node: list) -> None:
-    """helper function of the itrative minimax.
-       set the children of the node as formed [new_state1, [], None].
+def get_decided_score(game: Game, state: GameState) -> int:
+    """helper function of the minimax strategies. Return the score of the
+       decided state for the player whose turn it is at state.
+       Cannot provide examples since depend on game.
+    """
+    if game.is_over(state):
+        return get_terminal_score(game, state)
+    if state.get_decided_winner() == state.get_current_player_name():
+        return GameState.WIN
+    return GameState.LOSE
+
+
+def get_cursor_score(cursor: StateCursor) -> int:
+    """helper function of the minimax strategies. Return the score of the
+       decided position of cursor for the player whose turn it is there, as
+       get_decided_score does for a state.
+       Cannot provide examples since depend on StateCursor.
+    """
+    winner = cursor.get_decided_winner()
+    if winner is None:
+        return GameState.DRAW
+    if winner == cursor.get_current_player_name():
+        return GameState.WIN
+    return GameState.LOSE
+
+
+def state_key(state: GameState) -> Any:
+    """helper function of the minimax strategies. Return the key of state in
+       the transposition table, its cached get_key, which a Stonehenge state
+       shares with its mirror image since both have the same score.
        Cannot provide examples since depend on GameState.
     """
-    for move in new_state1.get_possible_moves():
-        new_node = [new_state1.make_move(move), [], None]
-        node[1].append(new_node)
+    return state.get_key()
+
 
+def exact_key(state: GameState) -> Any:
+    """helper function of the minimax strategies. Return a key of state that
+       is the same for states that are equal, however they were reached. A
+       state that defines its own hash and equality is its own key; any
+       other state is keyed by its repr.
+       Cannot provide examples since depend on GameState.
+    """
+    if type(state).__hash__ is not GameState.__hash__:
+        return state
+    return type(state).__name__, repr(state)
+
+
+def store_score(key: Any, score: int) -> None:
+    """helper function of the minimax strategies. Record score as the score
+       of the state with key, emptying the transposition table first when it
+       is full.
+    """
+    if len(transposition_table) >= TABLE_LIMIT:
+        transposition_table.clear()
+    transposition_table[key] = score
 
-def append_child_in_stack(stack_lst: list, node: list) -> None:
-    """helper function of the itearative minimax.
-       append all chirldren of node in the stack_lst.
+
+def iterative_method(game: Game, state: GameState) -> int:
+    """helper function of the iterative minimax. Return the score of state for
+       its current player.
+       Each node on the stack is [state, key, moves, next move index, best
+       score so far]. A child is only made when its parent is on top of the
+       stack, and its score goes straight into its parent's record when it is
+       finished, so the stack never holds more than one path of the tree.
        Cannot provide examples since depend on game.
     """
-    for nodes in node[1]:
-        stack_lst.append(nodes)
+    score = get_known_score(game, state)
+    if score is not None:
+        return score
+    stack_lst = [make_node(state)]
+    while True:
+        node = stack_lst[-1]
+        if node[3] < len(node[2]):
+            child = node[0].make_move(node[2][node[3]])
+            node[3] += 1
+            score = get_known_score(game, child)
+            if score is None:
+                stack_lst.append(make_node(child))
+                continue
+        else:
+            stack_lst.pop()
+            score = node[4]
+            store_score(node[1], score)
+            if stack_lst == []:
+                return score
+        parent = stack_lst[-1]
+        parent[4] = max(parent[4], score * (-1))
+
+
+def make_node(state: GameState) -> list:
+    """helper function of the iterative minimax. Return the stack node of a
+       state that is not over and has not been solved yet.
+       Cannot provide examples since depend on GameState.
+    """
+    return [state, state_key(state), state.get_move_tuple(), 0,
+            GameState.LOSE - 1]
 
 
-def get_node_score_from_children(node: list, score_lst: list) -> None:
-    """helper function of the itearative minimax.
-       get the node 's score from the node 's children 's score in score_lst.
+def get_known_score(game: Game, state: GameState) -> Any:
+    """helper function of the iterative minimax. Return the score of state if
+       it is already in the transposition table or the game is over at state,
+       otherwise None.
        Cannot provide examples since depend on game.
     """
-    max_score = []
-    for childs in node[1]:
-        for score_node in score_lst:
-            if childs[0] == score_node[0]:
-                max_score.append(score_node[2] * (-1))
-    node[2] = max(max_score)
+    key = state_key(state)
+    if key in transposition_table:
+        return transposition_table[key]
+    if is_decided(game, state):
+        score = get_decided_score(game, state)
+        store_score(key, score)
+        return score
+    return None
 
 
 if __name__ == "__main__":
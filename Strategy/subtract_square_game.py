@@ -41,7 +41,7 @@ class SubtractSquareGame(Game):
         :return: True if the game is over, False otherwise.
         :rtype: bool
         """
-        return state.current_total == 0
+        return state.is_over()
 
     def is_winner(self, player):
         """
@@ -54,8 +54,7 @@ class SubtractSquareGame(Game):
         :return: Whether player has won or not.
         :rtype: bool
         """
-        return (self.current_state.get_current_player_name() != player
-                and self.is_over(self.current_state))
+        return self.current_state.get_winner() == player
 
     def str_to_move(self, string):
         """
@@ -3,14 +3,18 @@ An implementation of a state for SubtractSquare.
 
 NOTE: You do not have to run python-ta on this file.
 """
-from typing import Any
-from game_state import GameState
+from typing import Any, List, Tuple
+from game_state import GameState, StateCursor
 
 
 class SubtractSquareState(GameState):
     """
     The state of a game at a certain point in time.
+
+    current_total - the total left to subtract from
     """
+    __slots__ = ('current_total',)
+    current_total: int
 
     def __init__(self, is_p1_turn: bool, current_total: int) -> None:
         """
@@ -26,7 +30,7 @@ class SubtractSquareState(GameState):
         """
         return "Current total: {}".format(self.current_total)
 
-    def get_possible_moves(self) -> list:
+    def _find_moves(self) -> list:
         """
         Return all possible moves that can be applied to this state.
         """
@@ -37,6 +41,29 @@ class SubtractSquareState(GameState):
 
         return moves
 
+    def _find_over(self) -> bool:
+        """
+        Return whether nothing is left to subtract from.
+        """
+        return self.current_total == 0
+
+    def _find_key(self) -> Any:
+        """
+        Return the key of this state: the name of its class, so that it is
+        never the key of another game's state in a shared table, whose turn
+        it is and the total.
+
+        >>> SubtractSquareState(True, 10).get_key()
+        ('SubtractSquareState', True, 10)
+        """
+        return 'SubtractSquareState', self.p1_turn, self.current_total
+
+    def cursor(self) -> "SubtractSquareCursor":
+        """
+        Return a SubtractSquareCursor that starts at this state.
+        """
+        return SubtractSquareCursor(self)
+
     def make_move(self, move: Any) -> "SubtractSquareState":
         """
         Return the GameState that results from applying move to this GameState.
@@ -71,6 +98,76 @@ class SubtractSquareState(GameState):
         return self.DRAW
 
 
+class SubtractSquareCursor(StateCursor):
+    """
+    A StateCursor for SubtractSquare that keeps one total and changes it in
+    place.
+
+    current_total - the total at this cursor
+    history - the moves pushed so far, the last one last
+    """
+    current_total: int
+    history: List[int]
+
+    def __init__(self, state: SubtractSquareState) -> None:
+        """
+        Initialize this cursor at state.
+        """
+        self.p1_turn = state.p1_turn
+        self.current_total = state.current_total
+        self.history = []
+
+    def push(self, move: Any) -> None:
+        """
+        Subtract move, which must be valid, from the total.
+
+        >>> cursor = SubtractSquareState(True, 10).cursor()
+        >>> cursor.push(9)
+        >>> cursor.get_possible_moves(), cursor.get_current_player_name()
+        ([1], 'p2')
+        >>> cursor.pop()
+        >>> cursor.get_key()
+        ('SubtractSquareState', True, 10)
+        """
+        if type(move) == str:
+            move = int(move)
+        self.history.append(move)
+        self.current_total -= move
+        self.p1_turn = not self.p1_turn
+
+    def pop(self) -> None:
+        """
+        Add the last move pushed back to the total.
+        """
+        self.current_total += self.history.pop()
+        self.p1_turn = not self.p1_turn
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be made on this cursor.
+        """
+        return [i ** 2 for i in range(1, int(self.current_total ** 0.5) + 2)
+                if i ** 2 <= self.current_total]
+
+    def is_over(self) -> bool:
+        """
+        Return whether nothing is left to subtract from.
+        """
+        return self.current_total == 0
+
+    def get_key(self) -> Tuple[str, bool, int]:
+        """
+        Return the key of the state this cursor stands for.
+        """
+        return 'SubtractSquareState', self.p1_turn, self.current_total
+
+    def to_state(self) -> SubtractSquareState:
+        """
+        Return the SubtractSquareState this cursor stands for.
+        """
+        return SubtractSquareState(self.p1_turn, self.current_total)
+
+
 def is_pos_square(n: int) -> bool:
     """
     Return whether n is a positive perfect square
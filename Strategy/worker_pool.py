@@ -0,0 +1,52 @@
+"""
+A module for the pool of worker processes shared by the parallel strategies.
+
+The pool is started the first time a parallel strategy asks for it and kept
+for the moves after that, so the worker processes are only started once.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from os import cpu_count
+from typing import Optional
+
+# Number of worker processes used when a strategy does not ask for a number.
+WORKERS = cpu_count() or 1
+
+_pool = {'executor': None, 'workers': 0}
+
+
+def get_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Return the shared pool of worker processes, with workers processes or
+    WORKERS when workers is None. The pool is started again if it was
+    started with a different number of processes.
+    """
+    if workers is None:
+        workers = WORKERS
+    if _pool['executor'] is None or _pool['workers'] != workers:
+        shutdown_executor()
+        # Workers that share this process's resource tracker register the
+        # shared memory blocks they attach to with it, where the process that
+        # made a block unregisters it again when it frees it. A worker
+        # started before the tracker would start one of its own instead, and
+        # that one tries to free every block again when the worker exits.
+        resource_tracker.ensure_running()
+        _pool['executor'] = ProcessPoolExecutor(max_workers=workers)
+        _pool['workers'] = workers
+    return _pool['executor']
+
+
+def shutdown_executor() -> None:
+    """
+    Stop the worker processes of the shared pool, if it was started.
+    """
+    if _pool['executor'] is not None:
+        _pool['executor'].shutdown()
+        _pool['executor'] = None
+        _pool['workers'] = 0
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")